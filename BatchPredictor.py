@@ -0,0 +1,226 @@
+import sys
+import json
+import argparse
+from multiprocessing import Pool
+from ID3_Class import ID3
+
+def read_carriers(task):
+    """
+    Reads which of the tested variants a chunk of samples carries out of a VCF file.
+    Only the loci of the tested variants are fetched from the file. Runs in the worker
+    processes of `BatchPredictor`
+
+    Args:
+        task (tuple): (path of the indexed VCF, list of sample ids, list of the tested variant names)
+
+    Returns:
+        carriers (dict): A dictionary where the
+                            key: is the sample id
+                            value: is the set of tested variant names the sample carries
+    """
+    import vcf
+    from local_API import is_carrier
+    vcf_path, samples, variant_names = task
+    reader = vcf.Reader(filename=vcf_path)
+    carriers = dict((sample, set()) for sample in samples)
+    wanted = set(variant_names)
+
+    for variant_name in variant_names:
+        chrom, start, end = variant_name.split(':')
+        for record in reader.fetch(chrom, int(start), int(end)):
+            name = ':'.join([str(record.CHROM), str(record.POS-1), str(record.POS)])
+            if name not in wanted:
+                continue
+            for sample in samples:
+                # checks if variant exists in person, see `is_carrier`
+                if is_carrier(record.genotype(sample).gt_alleles):
+                    carriers[sample].add(name)
+    return carriers
+
+class BatchPredictor:
+
+    def __init__(self, id3, chunk_size=500, processes=None):
+        """
+        Predicts the ancestry of every sample of one or more VCF files with a trained tree
+
+        Args:
+            id3 (ID3): the classifier, trained first if it isn't trained yet
+            chunk_size (int): number of samples of a VCF file read by one worker task
+            processes (int): number of worker processes, the number of CPUs if None
+
+        Attributes:
+            root_node (ID3_Node): the root node of the trained tree
+            variant_names (list): the variants tested by the tree, sorted by position
+        """
+        if id3.root_node is None:
+            id3.train()
+        self.root_node = id3.root_node
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.variant_names = BatchPredictor.tested_variants(self.root_node)
+
+    @staticmethod
+    def tested_variants(root_node):
+        """
+        Finds the variants the tree splits on
+
+        Args:
+            root_node (ID3_Node): the root node of the tree
+
+        Returns:
+            (list): names of the variants sorted by chromosome and position
+        """
+        variant_names = set()
+        stack = list(root_node.children)
+        while stack:
+            node = stack.pop()
+            variant_names.add(node.variant_name)
+            stack.extend(node.children)
+
+        def position(variant_name):
+            chrom, start, end = variant_name.split(':')
+            return chrom, int(start)
+        return sorted(variant_names, key=position)
+
+    def predict_batch(self, carriers):
+        """
+        Traverses the tree once for a batch of samples, splitting the batch at every node.
+        A sample stops at the deepest node its variants lead to, which is a leaf unless the
+        node has no child in the direction of the sample
+
+        Args:
+            carriers (dict): sample id mapped to the set of variant names the sample carries
+
+        Returns:
+            (dict): sample id mapped to the node the sample ends in
+        """
+        predictions = {}
+        stack = [(self.root_node, list(carriers))]
+        while stack:
+            node, samples = stack.pop()
+            remaining = samples
+            for child_node in node.children:
+                if child_node.with_variant:
+                    taken = [sample for sample in remaining if child_node.variant_name in carriers[sample]]
+                else:
+                    taken = [sample for sample in remaining if child_node.variant_name not in carriers[sample]]
+                if taken:
+                    stack.append((child_node, taken))
+                    taken = set(taken)
+                    remaining = [sample for sample in remaining if sample not in taken]
+            for sample in remaining:
+                predictions[sample] = node
+        return predictions
+
+    def create_tasks(self, vcf_paths):
+        """
+        Splits the samples of the VCF files into chunks of `chunk_size`. Only the tested
+        variants on the chromosomes of a file are read from it, see `fetchable_variants`
+
+        Args:
+            vcf_paths (list): paths of the indexed VCF files
+
+        Returns:
+            (list): the tasks of `read_carriers`
+        """
+        import vcf
+        tasks = []
+        for vcf_path in vcf_paths:
+            variant_names = self.fetchable_variants(vcf_path)
+            samples = vcf.Reader(filename=vcf_path).samples
+            for i in range(0, len(samples), self.chunk_size):
+                tasks.append((vcf_path, samples[i:i + self.chunk_size], variant_names))
+        return tasks
+
+    def fetchable_variants(self, vcf_path):
+        """
+        Finds the tested variants on the chromosomes of an indexed VCF. A sample reads as
+        having none of the variants of a chromosome missing from the file, so a warning is
+        written for every missing chromosome, and a file without any of the chromosomes
+        (e.g. named `chr22` instead of `22`) is rejected
+
+        Args:
+            vcf_path (str): path of the indexed VCF
+
+        Returns:
+            (list): the tested variants that can be fetched from the file
+        """
+        import pysam
+        contigs = set(pysam.TabixFile(vcf_path).contigs)
+        tested_chroms = sorted(set(variant_name.split(':')[0] for variant_name in self.variant_names))
+        missing = [chrom for chrom in tested_chroms if chrom not in contigs]
+        if missing and len(missing) == len(tested_chroms):
+            raise ValueError("None of the chromosomes tested by the tree (%s) are in %s, which has: %s"
+                             % (', '.join(missing), vcf_path, ', '.join(sorted(contigs))))
+        for chrom in missing:
+            sys.stderr.write("warning: chromosome %s is not in %s, its variants are read as absent\n" % (chrom, vcf_path))
+        return [variant_name for variant_name in self.variant_names if variant_name.split(':')[0] in contigs]
+
+    def predict_vcfs(self, vcf_paths):
+        """
+        Predicts the ancestry of every sample in the VCF files. The genotypes are read by
+        a pool of worker processes one chunk of samples at a time and every chunk is
+        classified as soon as it is read
+
+        Args:
+            vcf_paths (list): paths of the indexed VCF files (multi-sample or per-sample)
+
+        Returns:
+            (generator): (sample id, node the sample ends in) for every sample
+        """
+        tasks = self.create_tasks(vcf_paths)
+        pool = Pool(self.processes)
+        try:
+            for carriers in pool.imap(read_carriers, tasks):
+                predictions = self.predict_batch(carriers)
+                for sample in sorted(predictions):
+                    yield sample, predictions[sample]
+        finally:
+            pool.close()
+            pool.join()
+
+    @staticmethod
+    def write_predictions(predictions, out_path, file_format='tsv'):
+        """
+        Writes predictions one line at a time, either as a TSV with the columns
+        `sample`, `ancestry`, `total_count` and `counts` (JSON of the counts of the
+        node), or as a JSON list of objects with the same keys
+
+        Args:
+            predictions (iterable): (sample id, node) pairs as returned by `predict_vcfs`
+            out_path (str): path of the output file
+            file_format (str): `tsv` or `json`
+        """
+        with open(out_path, 'w') as f:
+            if file_format == 'tsv':
+                f.write('sample\tancestry\ttotal_count\tcounts\n')
+            else:
+                f.write('[')
+            for i, (sample, node) in enumerate(predictions):
+                counts = dict((k, v) for k, v in node.subset.items() if v)
+                if file_format == 'tsv':
+                    f.write('%s\t%s\t%s\t%s\n' % (sample, node.most_common_ancestry, node.total_count, json.dumps(counts, sort_keys=True)))
+                else:
+                    f.write('%s\n%s' % (',' if i else '', json.dumps({
+                        'sample': sample,
+                        'ancestry': node.most_common_ancestry,
+                        'total_count': node.total_count,
+                        'counts': counts
+                    }, sort_keys=True)))
+            if file_format != 'tsv':
+                f.write('\n]\n')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Predicts the ancestry of the samples in VCF files')
+    parser.add_argument('vcf_paths', nargs='+', help='indexed VCF files (multi-sample or per-sample)')
+    parser.add_argument('-c', '--config', default='config.json', help='config of the tree to train')
+    parser.add_argument('-m', '--model', default=None, help='model saved by `ID3.save` to predict with instead of training a tree')
+    parser.add_argument('-o', '--output', default='predictions.tsv', help='path of the output file')
+    parser.add_argument('-f', '--format', default='tsv', choices=['tsv', 'json'])
+    parser.add_argument('--chunk-size', type=int, default=500, help='samples read per worker task')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes')
+    args = parser.parse_args()
+
+    id3 = ID3.load(args.model, args.config) if args.model else ID3(args.config)
+    predictor = BatchPredictor(id3, chunk_size=args.chunk_size, processes=args.processes)
+    BatchPredictor.write_predictions(predictor.predict_vcfs(args.vcf_paths), args.output, args.format)
@@ -1,12 +1,9 @@
 from __future__ import division
-from ID3_Class import ID3
-from local_API import LOCAL_API
-from ga4gh_API import GA4GH_API
-from ID3_Node import ID3_Node
+from ID3_Class import ID3, load_backend
 
 class ConfusionMatrix(ID3):
 
-    def __init__(self, file_path='config.json'):
+    def __init__(self, file_path='config.json', backend='local'):
         '''
         Creates confusion matrix with the first index (Y) as the correct population and the
         second index (X) as the predicted population. THe order of the ancestries is dictated
@@ -17,6 +14,7 @@ class ConfusionMatrix(ID3):
 
         Args:
             file_path (str): Path to json file that contains the variant rangess
+            backend (str): name of a backend with the interface of LOCAL_API, `local` or `snapshot`
 
         Attributes:
             api (API): API object that is used to interact with the virtual API
@@ -29,20 +27,16 @@ class ConfusionMatrix(ID3):
             total (int): total sum of all values in matrix
         '''
 
-        # modify API for conf_matrix
-        self.api = LOCAL_API(file_path, conf_matrix=True)
-
-        # initialize ID3 algorithm
-        subset = self.api.get_target_set()
-        self.root_node = ID3_Node('root', subset, True)
-        self.ID3(self.root_node)
+        # initialize ID3 algorithm, the matrix needs the trained tree right away
+        ID3.__init__(self, file_path, backend=backend)
+        self.train()
 
         # create conf_matrix and calculate useful attributes
         self.length = len(self.api.ancestry_list)
         self.conf_matrix = [ [0 for x in range(0, self.length)] for y in range(0, self.length) ]
 
         for variants, popu in zip(self.api.test_variant_list, self.api.test_popu_list):
-            include_variants = [self.api.variant_name_list[idx] for idx, is_variant in enumerate(variants) if is_variant == 1]
+            include_variants = self.api.row_variant_names(variants)
 
             # Actual Result
             y = self.api.ancestry_list.index( popu )
@@ -54,6 +48,15 @@ class ConfusionMatrix(ID3):
         self.diagonal_sum = sum( [self.conf_matrix[i][i] for i in range(0, self.length)] )
         self.total = sum( [sum(self.conf_matrix[i]) for i in range(0, self.length)] )
 
+    def create_api(self):
+        """
+        Creates the API object with half of the individuals held out for testing
+
+        Returns:
+            (API): API object that is used to interact with the virtual API
+        """
+        return load_backend(self.backend)(self.file_path, conf_matrix=True)
+
     def accuracy(self):
         '''
         How often the classifier is correct
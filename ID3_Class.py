@@ -1,34 +1,164 @@
 from __future__ import division
 import math
-from anytree import Node, RenderTree
-from anytree.exporter import DotExporter
-from local_API import LOCAL_API
-from ga4gh_API import GA4GH_API
-from ID3_Node import ID3_Node
+import json
+import time
+import heapq
+import itertools
+import importlib
+
+# maps a backend name to the (module, class) implementing it, so the
+# dependencies of a backend are only imported when it is actually used
+BACKENDS = {
+    'local': ('local_API', 'LOCAL_API'),
+    'ga4gh': ('ga4gh_API', 'GA4GH_API'),
+    'sharded': ('sharded_API', 'SHARDED_API'),
+    'snapshot': ('snapshot_API', 'SNAPSHOT_API'),
+}
+
+def load_backend(name):
+    """
+    Imports and returns the API class registered under a backend name
+
+    Args:
+        name (str): name of the backend in `BACKENDS`
+
+    Returns:
+        (class): the API class of the backend
+    """
+    if name not in BACKENDS:
+        raise ValueError("Unknown backend '%s', expected one of: %s" % (name, ', '.join(sorted(BACKENDS))))
+    module_name, class_name = BACKENDS[name]
+    return getattr(importlib.import_module(module_name), class_name)
 
 class ID3:
 
-    def __init__(self, file_path='config.json', local=True):
+    def __init__(self, file_path='config.json', local=True, backend=None, api=None, limits=None):
         """
-        Initializes the ID3 class
+        Initializes the ID3 class. Neither the API nor the tree are created here,
+        the API is created on first access of `api` and the tree is trained by
+        `train` or on the first call to `predict` or `print_tree`
 
         Args:
             file_path (str): Path to json file that contains the variant ranges
             local (bool): flag to determine whether or not to read locally or from a server
+            backend (str): name of the backend in `BACKENDS`, overrides the `local` flag
+            api (API): API object to use instead of creating one from the backend
+            limits (dict): limits of the build, overriding `build_limits` of the config:
+                max_depth (int): maximum number of splits from the root to a leaf
+                min_samples_split (int): minimum number of people in a node to split it
+                min_samples_leaf (int): minimum number of people on each side of a split
+                min_gain (float): minimum information gain of a split
+                max_nodes (int): maximum number of nodes in the tree
+                max_seconds (float): time budget of the build
+                max_requests (int): budget of requests to the API (`/count` requests for
+                                    the ga4gh backend, method calls otherwise)
 
         Attributes:
-            api (API): API object that is used to interact with the virtual API
-            root_node (Node): Creates the root node of the tree to be added upon
+            file_path (str): Path to json file that contains the variant ranges
+            backend (str): name of the backend used to create the API
+            root_node (Node): the root node of the tree, None until the tree is trained
+            limits (dict): limits of the last build, `limits` merged into `build_limits` of the config
+            api_calls (int): number of calls made to the API while building
 
         TODO:
             * Add logging so user can know if the classifier is working
         """
-        
-        self.api = LOCAL_API(file_path) if local else GA4GH_API(file_path)
+        self.file_path = file_path
+        self.backend = backend or ('local' if local else 'ga4gh')
+        self._api = api
+        self.root_node = None
+        self.build_limits = limits or {}
+        self.limits = dict(self.build_limits)
+        self.api_calls = 0
+
+    @property
+    def api(self):
+        """
+        API object that is used to interact with the virtual API, created on first access
+        """
+        if self._api is None:
+            self._api = self.create_api()
+        return self._api
+
+    def create_api(self):
+        """
+        Creates the API object of the configured backend
+
+        Returns:
+            (API): API object that is used to interact with the virtual API
+        """
+        return load_backend(self.backend)(self.file_path)
+
+    def train(self):
+        """
+        Builds the tree from the data of the API, replacing any tree built before
+
+        Returns:
+            root_node (ID3_Node): the root node of the trained tree
+        """
+        from ID3_Node import ID3_Node
+        config = getattr(self.api, 'config', {})
+        self.limits = dict(config.get('build_limits', {}), **self.build_limits)
         subset = self.api.get_target_set()
         self.root_node = ID3_Node('root', subset, True)
         self.ID3(self.root_node)
+        return self.root_node
+
+
+    def save(self, path):
+        """
+        Saves the trained tree as a JSON model, training the tree first if needed. The nodes
+        are stored as a flat list in preorder where every node refers to its parent by index
+
+        Args:
+            path (str): path of the model file
+        """
+        if self.root_node is None:
+            self.train()
+        nodes = []
+        stack = [(self.root_node, None)]
+        while stack:
+            node, parent_idx = stack.pop()
+            nodes.append([parent_idx, node.variant_name, node.with_variant, list(node.counts)])
+            node_idx = len(nodes) - 1
+            for child in reversed(node.children):
+                stack.append((child, node_idx))
+        model = {
+            'ancestries': list(self.root_node.ancestries),
+            'variant_name_list': list(self.api.variant_name_list),
+            'nodes': nodes
+        }
+        with open(path, 'w') as f:
+            json.dump(model, f)
+
+    @staticmethod
+    def load(path, file_path='config.json', local=True, backend=None):
+        """
+        Loads a model saved by `save`. The API is only created if it is used, so predicting
+        with a loaded model doesn't read any variants
+
+        Args:
+            path (str): path of the model file
+            file_path (str): Path to json file that contains the variant ranges, used by the API
+            local (bool): flag to determine whether or not to read locally or from a server
+            backend (str): name of the backend in `BACKENDS`, overrides the `local` flag
 
+        Returns:
+            id3 (ID3): the classifier with the loaded tree
+        """
+        from ID3_Node import ID3_Node
+        with open(path) as f:
+            model = json.load(f)
+        ancestries = model['ancestries']
+        # shares one string object per variant name between the nodes
+        names = dict((name, name) for name in model['variant_name_list'])
+        nodes = []
+        for parent_idx, variant_name, with_variant, counts in model['nodes']:
+            parent = nodes[parent_idx] if parent_idx is not None else None
+            nodes.append(ID3_Node(names.get(variant_name, variant_name), dict(zip(ancestries, counts)), with_variant, parent=parent))
+        id3 = ID3(file_path, local, backend)
+        id3.root_node = nodes[0]
+        return id3
 
     @staticmethod
     def get_subset_count(subset):
@@ -76,6 +206,8 @@ class ID3:
         Returns:
             node (ID3_Node): Custom object that has information about the leaf node
         """
+        if self.root_node is None:
+            self.train()
         node = self.root_node
         # finds leaf node 
         while node.children:
@@ -92,6 +224,33 @@ class ID3:
         return node
 
 
+    def can_split(self, subset, split_path):
+        """
+        Checks if a node could be split before searching for the split, so nodes that
+        can't be split never cost a request to the API
+
+        Args:
+            subset (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
+            split_path (list1, list2): 
+                This is the paths of the splits before the current split. The first list
+                is the list of variant names and the second list is the direction
+                of the split. The direction of the second list is depicted by 1's
+                and 0's. Where 1 is splitting in the direction with the variant
+                and 0 is splitting in the direction without the variant. 
+
+        Returns:
+            (bool): False if the node has to be a leaf node
+        """
+        # check if all variants are of one ancestry (Essentially if all remaining variants(attributes) contains one region(value))
+        upd_var_count = { k : v for k, v in subset.items() if v != 0 }
+        if len(upd_var_count) <= 1 or len(split_path[0]) >= len(self.api.variant_name_list):
+            return False
+        if self.limits.get('max_depth') is not None and len(split_path[0]) >= self.limits['max_depth']:
+            return False
+        if sum(subset.values()) < self.limits.get('min_samples_split', 2):
+            return False
+        return True
+
     def is_leaf_node(self, subset, split_path, split_index):
         """
         Checks if the node is a leaf node given a subset
@@ -108,30 +267,91 @@ class ID3:
 
         Returns:
             (bool): the boolean value represents whether or not the node is a leaf node
+        """
+        return split_index is None or not self.can_split(subset, split_path) or ID3.entropy_by_count(subset) == 0
 
-        TODO:
-            * Clean up leaf node if statement and ensure it is still valid
-            * See why entropy by count == 0 doesn't do much
+    def budget_exhausted(self, node_count, start_time, start_requests):
+        """
+        Checks if splitting one more node would go over the budget of the build
 
+        Args:
+            node_count (int): number of nodes in the tree
+            start_time (float): time the build started
+            start_requests (int): requests made to the API before the build started
 
+        Returns:
+            (bool): True if the build has to stop
         """
-        # check if all variants are of one ancestry (Essentially if all remaining variants(attributes) contains one region(value))
-        attr_list = set()
-        upd_var_count = { k : v for k, v in subset.items() if v != 0 }
-        attr_list.update(upd_var_count.keys())
-        if len(attr_list) == 1 or len(split_path[0]) >= len(self.api.variant_name_list) or split_index is None or ID3.entropy_by_count(subset) == 0:
-        #if len(attr_list) == 1 or len(split_path[0]) >= 5 or split_index is None or ID3.entropy_by_count(subset) == 0:
+        limits = self.limits
+        if limits.get('max_nodes') is not None and node_count + 2 > limits['max_nodes']:
+            return True
+        if limits.get('max_seconds') is not None and time.time() - start_time >= limits['max_seconds']:
+            return True
+        if limits.get('max_requests') is not None and self.requests_made() - start_requests >= limits['max_requests']:
             return True
         return False
 
-    def print_tree(self, file_name):
-        DotExporter(self.root_node, nodenamefunc=ID3_Node.name_func).to_picture("%s.png" % file_name)
+    def requests_made(self):
+        """
+        Returns:
+            (int): the requests made to the server if the API counts them, otherwise the calls made to the API
+        """
+        return getattr(self.api, 'request_count', self.api_calls)
+
+    def print_tree(self, file_name, max_depth=None, min_samples=0):
+        """
+        Renders the tree as `<file_name>.png` with Graphviz, training the tree first if needed.
+        The tree is written to `<file_name>.dot` first, see `export_tree`
+
+        Args:
+            file_name (str): name of the image file without the extension
+            max_depth (int): depth of the deepest nodes rendered, no limit if None
+            min_samples (int): minimum number of people in a node to render its children
+        """
+        self.export_tree(file_name, 'dot', max_depth, min_samples, render=True)
+
+    def export_tree(self, file_name, file_format='dot', max_depth=None, min_samples=0, render=False):
+        """
+        Writes the tree to `<file_name>.dot` or `<file_name>.json` one node at a time, training
+        the tree first if needed. Subtrees below `max_depth` or of nodes with fewer than
+        `min_samples` people are collapsed into a summary of their size
+
+        Args:
+            file_name (str): name of the file without the extension
+            file_format (str): `dot` or `json`
+            max_depth (int): depth of the deepest nodes written, no limit if None
+            min_samples (int): minimum number of people in a node to write its children
+            render (bool): also renders a DOT file as `<file_name>.png` with Graphviz
 
-    def find_variant_split(self, subset, split_path):
+        Returns:
+            path (str): path of the written file
+        """
+        import tree_export
+        if file_format not in ('dot', 'json'):
+            raise ValueError("Unknown tree format '%s', expected 'dot' or 'json'" % file_format)
+        if self.root_node is None:
+            self.train()
+        path = "%s.%s" % (file_name, file_format)
+        with open(path, 'w') as f:
+            if file_format == 'dot':
+                tree_export.write_dot(self.root_node, f, max_depth, min_samples)
+            else:
+                tree_export.write_json(self.root_node, f, max_depth, min_samples)
+        if render and file_format == 'dot':
+            import subprocess
+            subprocess.check_call(['dot', '-Tpng', path, '-o', "%s.png" % file_name])
+        return path
+
+    def find_variant_split(self, subset, split_path, candidates=None):
         """
         Finds the variant to split on and returns the index where it should be split on.
         This calculation is based on which attribute gives the greatest information gain.
 
+        Also finds which of the candidates can still split the subset. A variant that no
+        one in the subset has, or that everyone in the subset has, can't split the subset
+        or any subset below it, so it is left out of the candidates of the children. The
+        same goes for a variant that splits off fewer than `min_samples_leaf` people.
+
         Args:
             subset (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
             split_path (list1, list2): 
@@ -140,75 +360,111 @@ class ID3:
                 of the split. The direction of the second list is depicted by 1's
                 and 0's. Where 1 is splitting in the direction with the variant
                 and 0 is splitting in the direction without the variant. 
+            candidates (list): indices of the variants that can still be split on, all of the
+                               variants if None
 
         Returns:
             ret_index (int): index that yields the greatest information gain
+            final_info_gain (float): the information gain of the split
+            live_candidates (list): indices of the candidates that can still split the subset
 
         """
-
-        variant_list = self.api.find_next_variant_counts(split_path)
+        if candidates is None:
+            candidates = range(len(self.api.variant_name_list))
+        var_idx_list = set(self.api.variant_name_list.index(var_name) for var_name in split_path[0])
+        candidates = [idx for idx in candidates if idx not in var_idx_list]
         total_count = sum(subset.values())
-        ret_index = 0
-        final_info_gain = 0
-        var_idx_list = [self.api.variant_name_list.index(var_name) for var_name in split_path[0]]
 
-        if total_count == 0:
-            return None
+        if total_count == 0 or not candidates:
+            return None, 0, []
 
-        # loops through all the counts for each variant
-        for idx, w_var_counts in enumerate(variant_list):
-            wo_var_counts = { k : subset.get(k, 0) - w_var_counts.get(k, 0) for k in subset.keys() + w_var_counts.keys() }
+        self.api_calls += 1
+        variant_list = self.api.find_next_variant_counts(split_path, candidates)
+        min_samples_leaf = max(1, self.limits.get('min_samples_leaf', 1))
+        ret_index = 0
+        final_info_gain = 0
+        live_candidates = []
+
+        # loops through all the counts for each candidate variant
+        for idx in candidates:
+            w_var_counts = variant_list[idx]
+            w_total = sum(w_var_counts.values())
+            # variant can't split this subset or any subset below it
+            if w_total < min_samples_leaf or total_count - w_total < min_samples_leaf:
+                continue
+            live_candidates.append(idx)
+            wo_var_counts = { k : subset.get(k, 0) - w_var_counts.get(k, 0) for k in set(subset) | set(w_var_counts) }
 
             # calculates info gain
-            info_gain = ID3.entropy_by_count(subset) - ( sum(wo_var_counts.values()) / total_count * ID3.entropy_by_count(wo_var_counts) + sum(w_var_counts.values()) / total_count * ID3.entropy_by_count(w_var_counts) )
-            # finds max info gain and checks if the index is not in excluded variants list
-            if final_info_gain < info_gain and idx not in var_idx_list:
+            info_gain = ID3.entropy_by_count(subset) - ( sum(wo_var_counts.values()) / total_count * ID3.entropy_by_count(wo_var_counts) + w_total / total_count * ID3.entropy_by_count(w_var_counts) )
+            # finds max info gain
+            if final_info_gain < info_gain:
                 final_info_gain = info_gain
                 ret_index = idx
         # checks if there is any info gain
-        if final_info_gain <= 1.e-8:
-            return None
-        return ret_index
+        if final_info_gain <= max(1.e-8, self.limits.get('min_gain', 0)):
+            return None, final_info_gain, live_candidates
+        return ret_index, final_info_gain, live_candidates
 
     # note: variant list must be same length as count list
-    def ID3(self, node):
+    def ID3(self, node, candidates=None):
         """
-        A recursive function that creates a tree given the root node and a subset
+        Creates the tree below a node. The nodes are split best first: every open node is
+        queued by the information gain of its best split and the node with the highest gain
+        is split next. When the budget of the build (`max_nodes`, `max_seconds` or
+        `max_requests` in `limits`) runs out, the nodes still open are left as leaf nodes.
+        The budget is checked before every split search, so the build can only go over it
+        by the requests of the last search and split
 
         Note: variant list must be same length as count list
 
         Args:
-            node (Node): A node object from the anytree library
-            split_path (list1, list2): 
-                This is the paths of the splits before the current split. The first list
-                is the list of variant names and the second list is the direction
-                of the split. The direction of the second list is depicted by 1's
-                and 0's. Where 1 is splitting in the direction with the variant
-                and 0 is splitting in the direction without the variant. 
-
-        TODO:
-            * Clean up if statements that check if the subset values are greater than 0 (should be taken care of in leaf node calc)
-
+            node (ID3_Node): the node to build the subtree below
+            candidates (list): indices of the variants that can still split the subset of the
+                               node, all of the variants if None
         """
-        # find the attrivute to split on and adds that variant to exclude variant list
-        print("Created Node")
-        subset = node.subset
-        split_index = self.find_variant_split(subset, node.split_path)
-        if not self.is_leaf_node(subset, node.split_path, split_index):
+        start_time = time.time()
+        start_requests = self.requests_made()
+        node_count = 1
+        open_nodes = []
+        # breaks ties between equal gains in the order the nodes were created
+        order = itertools.count()
+
+        def add_open_node(node, candidates):
+            # find the attribute to split on and queue the node if it can be split
+            print("Created Node")
+            subset = node.subset
+            split_path = node.split_path
+            if not self.can_split(subset, split_path):
+                return
+            # searching the split costs a request per candidate with the ga4gh backend, a node
+            # created once the budget ran out is left as a leaf node without searching it
+            if self.budget_exhausted(node_count, start_time, start_requests):
+                return
+            split_index, info_gain, live_candidates = self.find_variant_split(subset, split_path, candidates)
+            if not self.is_leaf_node(subset, split_path, split_index):
+                heapq.heappush(open_nodes, (-info_gain, next(order), node, split_index, live_candidates))
+
+        add_open_node(node, candidates)
+        while open_nodes:
+            if self.budget_exhausted(node_count, start_time, start_requests):
+                print("Build budget exhausted, %s open nodes left as leaf nodes" % len(open_nodes))
+                break
+            _, _, node, split_index, live_candidates = heapq.heappop(open_nodes)
             var_name = self.api.variant_name_list[split_index]
+            child_candidates = [idx for idx in live_candidates if idx != split_index]
 
+            self.api_calls += 1
             w_subset, wo_subset = self.api.split_subset(node, var_name)
 
-            w_split_path, wo_split_path = self.api.create_split_path(node.split_path, var_name)
-
-
-            if sum(w_subset.values()) > 0:
-                self.ID3(ID3_Node(var_name, dict(w_subset), with_variant=True, split_path=w_split_path, parent=node))
-            if sum(wo_subset.values()) > 0:
-                self.ID3(ID3_Node(var_name, dict(wo_subset), with_variant=False, split_path=wo_split_path, parent=node))
+            for child_subset, with_variant in ((w_subset, True), (wo_subset, False)):
+                if sum(child_subset.values()) > 0:
+                    node_count += 1
+                    add_open_node(type(node)(var_name, child_subset, with_variant=with_variant, parent=node), child_candidates)
 
 if __name__ == "__main__":
     id3_alg = ID3('config.json', local=True)
+    id3_alg.train()
     print id3_alg.api.variant_name_list
     id3_alg.print_tree('udo1')
     #print id3_alg.api.ancestry_list
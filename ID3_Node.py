@@ -1,17 +1,130 @@
-from anytree import NodeMixin
+from array import array
 
-class ID3_Node(NodeMixin):
-    def __init__(self, variant_name, subset, with_variant, split_path=([], []), parent=None, children=None):
-        super(ID3_Node, self).__init__()
+class ID3_Node(object):
+    """
+    A node of the ID3 tree. Nodes are kept small since trees can have a lot of them:
+    the counts of the ancestries are stored in an integer array next to a tuple of
+    ancestry names that is shared by every node of the tree, and the split path is
+    rebuilt from the parent pointers when it is needed instead of being copied into
+    every node.
+
+    Args:
+        variant_name (str): name of the variant the parent node was split on, `root` for the root
+        subset (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
+        with_variant (bool): whether the node is in the direction with the variant
+        parent (ID3_Node): the parent node, None for the root
+        children (list): child nodes to attach to this node
+
+    Attributes:
+        ancestries (tuple): names of the ancestries, shared with the parent node
+        counts (array): counts of every ancestry in `ancestries`
+        children (tuple): the child nodes
+    """
+    __slots__ = ('variant_name', 'with_variant', 'ancestries', 'counts', 'parent', 'children')
+
+    def __init__(self, variant_name, subset, with_variant, parent=None, children=None):
         self.variant_name = variant_name
         self.with_variant = with_variant
-        self.subset = subset
-        self.total_count = str(sum(subset.values()))
-        self.most_common_ancestry = str(max(subset, key=subset.get))
-        self.parent = parent
-        self.split_path = split_path
-        if children:
-            self.children = children
+        self.ancestries = parent.ancestries if parent is not None else tuple(sorted(subset))
+        if not set(subset) <= set(self.ancestries):
+            self.ancestries = self.ancestries + tuple(sorted(set(subset) - set(self.ancestries)))
+        self.counts = array('l', [subset.get(ancestry, 0) for ancestry in self.ancestries])
+        self.parent = None
+        self.children = ()
+        if parent is not None:
+            parent.add_child(self)
+        for child in children or ():
+            self.add_child(child)
+
+    def add_child(self, child):
+        """
+        Attaches a node as a child of this node
+
+        Args:
+            child (ID3_Node): the node to attach
+        """
+        child.parent = self
+        self.children += (child,)
+
+    @property
+    def subset(self):
+        """
+        (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
+        """
+        return dict(zip(self.ancestries, self.counts))
+
+    @property
+    def total_count(self):
+        """
+        (int): number of people in the node
+        """
+        return sum(self.counts)
+
+    @property
+    def most_common_ancestry(self):
+        """
+        (str): the ancestry with the highest count in the node
+        """
+        return self.ancestries[max(range(len(self.counts)), key=self.counts.__getitem__)]
+
+    @property
+    def is_leaf(self):
+        return not self.children
+
+    @property
+    def depth(self):
+        """
+        (int): number of splits between the root and the node
+        """
+        depth = 0
+        node = self.parent
+        while node is not None:
+            depth += 1
+            node = node.parent
+        return depth
+
+    @property
+    def split_path(self):
+        """
+        (list1, list2): the paths of the splits from the root to the node. The first list
+            is the list of variant names and the second list is the direction of the split,
+            where 1 is splitting in the direction with the variant and 0 is splitting in the
+            direction without the variant. Rebuilt from the parent pointers on every access
+        """
+        variant_names = []
+        directions = []
+        node = self
+        while node.parent is not None:
+            variant_names.append(node.variant_name)
+            directions.append(1 if node.with_variant else 0)
+            node = node.parent
+        variant_names.reverse()
+        directions.reverse()
+        return variant_names, directions
+
+    def to_anytree(self):
+        """
+        Copies the tree below this node into `anytree` nodes, so the rendering and
+        iteration utilities of `anytree` (e.g. `DotExporter`, `RenderTree`) can be used.
+        `name_func` and `nodeattrfunc` work on the copied nodes
+
+        Returns:
+            (AnyNode): the copy of this node
+        """
+        from anytree import AnyNode
+
+        def copy(node, parent):
+            return AnyNode(parent=parent, variant_name=node.variant_name, with_variant=node.with_variant,
+                           subset=node.subset, total_count=node.total_count,
+                           most_common_ancestry=node.most_common_ancestry)
+
+        root = copy(self, None)
+        stack = [(self, root)]
+        while stack:
+            node, any_node = stack.pop()
+            for child in node.children:
+                stack.append((child, copy(child, any_node)))
+        return root
 
     @staticmethod
     def name_func(node):
@@ -19,4 +132,4 @@ class ID3_Node(NodeMixin):
 
     @staticmethod
     def nodeattrfunc(node):
-        return "most common ancestry: %s | total count: %s" % (node.most_common_ancestry, node.total_count)
\ No newline at end of file
+        return "most common ancestry: %s | total count: %s" % (node.most_common_ancestry, node.total_count)
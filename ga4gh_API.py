@@ -1,8 +1,16 @@
 import json
 import requests
+from multiprocessing.pool import ThreadPool
+from range_planner import plan_ranges, in_window, unique
+
+# ijson is optional, it allows large responses to be parsed incrementally
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 class GA4GH_API:
-    def __init__(self, file_path):
+    def __init__(self, file_path, config=None, fetch=True):
         """
         Initializes the GA4GH_API class
 
@@ -12,6 +20,9 @@ class GA4GH_API:
 
         Args:
             file_path (str): Path to json file that contains the variant ranges
+            config (dict): config to use instead of the one at `file_path`
+            fetch (bool): queries the variant names of the variant ranges, False to only
+                          use the object to make requests to the server (see `search`)
 
         Attributes:
             config (json): loaded config file
@@ -22,15 +33,24 @@ class GA4GH_API:
                                           "CHROMOSOME_#:START_POS:END_POS" (TODO - UPDATE TO THIS)
             ancestry_list (list): A unique list of all the ancestries of people
             is_conf_matrix (bool): tells API to initialize the API for confusion matrix operations
+            page_size (int): number of results requested per page (`ga4gh_page_size` in the config)
+            max_workers (int): number of variant ranges that are searched concurrently
+                               (`ga4gh_max_workers` in the config)
+            request_count (int): number of requests made to the server
 
         TODO:
             * Throw error when server gives incorrect response
         """
-        with open(file_path) as f:
-            self.config = json.load(f)
+        if config is None:
+            with open(file_path) as f:
+                config = json.load(f)
+        self.config = config
         self.host_url = self.config['ga4gh_server_url']
         self.dataset_id = self.config['ga4gh_server_dataset_id']
-        self.variant_name_list = self.fetch_variants(file_path)
+        self.page_size = int(self.config.get('ga4gh_page_size', 10000))
+        self.max_workers = int(self.config.get('ga4gh_max_workers', 4))
+        self.request_count = 0
+        self.variant_name_list = self.fetch_variants(file_path) if fetch else []
         self.ancestry_list = []
 
         # updates variables
@@ -64,17 +84,136 @@ class GA4GH_API:
 
         return w_split_path, wo_split_path
 
+    def post(self, endpoint, req_body, stream=False):
+        """
+        Posts a request body to an endpoint of the ga4gh server
+
+        Args:
+            endpoint (str): endpoint relative to the server url, e.g. `count`
+            req_body (dict): JSON body of the request
+            stream (bool): leaves the response body unread so it can be parsed incrementally
+
+        Returns:
+            (Response): the response of the server
+        """
+        self.request_count += 1
+        r = requests.post('%s%s' % (self.host_url, endpoint), json=req_body, stream=stream)
+        r.raise_for_status()
+        if stream:
+            r.raw.decode_content = True
+        return r
+
+    def search(self, endpoint, req_body, key):
+        """
+        Reads all the pages of a search endpoint, following `nextPageToken`
+
+        Args:
+            endpoint (str): search endpoint relative to the server url, e.g. `patients/search`
+            req_body (dict): JSON body of the search
+            key (str): key of the list of results, e.g. `patients`
+
+        Returns:
+            results (list): the results of all of the pages
+        """
+        req_body = dict(req_body, pageSize=self.page_size)
+        results = []
+        while True:
+            r = self.post(endpoint, req_body, stream=True)
+            try:
+                page, page_token = GA4GH_API.read_page(r, key)
+            finally:
+                r.close()
+            results.extend(page)
+            if not page_token:
+                return results
+            req_body['pageToken'] = page_token
+
+    @staticmethod
+    def read_page(response, key):
+        """
+        Reads the results and the token of the next page out of a page of a search endpoint.
+        When ijson is installed the results are built one at a time while the response is
+        parsed, otherwise the whole page is loaded
+
+        Args:
+            response (Response): streamed response of the search
+            key (str): key of the list of results, e.g. `patients`
+
+        Returns:
+            results (list): the results of the page
+            page_token (str): token of the next page, None if it is the last page
+        """
+        if ijson is None:
+            r = response.json()
+            return r['results'].get(key, []), r['results'].get('nextPageToken') or r.get('nextPageToken')
+
+        item_prefix = 'results.%s.item' % key
+        results = []
+        page_token = None
+        builder = None
+        for prefix, event, value in ijson.parse(response.raw):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == item_prefix and event in ('end_map', 'end_array'):
+                    results.append(builder.value)
+                    builder = None
+            elif prefix == item_prefix:
+                if event in ('start_map', 'start_array'):
+                    builder = ijson.common.ObjectBuilder()
+                    builder.event(event, value)
+                else:
+                    results.append(value)
+            elif prefix in ('results.nextPageToken', 'nextPageToken') and value:
+                page_token = value
+        return results, page_token
+
     def fetch_variants(self, file_path):
+        """
+        Queries the variant names of all the variant ranges in the config. The ranges are
+        planned with `plan_ranges` first so every region is queried once, the windows are
+        searched concurrently by `max_workers` threads and the names are returned sorted by
+        chromosome and position without repetitions
+
+        Args:
+            file_path (str): Path to json file that contains the variant ranges
+
+        Returns:
+            variant_list (list): list of variant names formatted in the for of `CHR:START:END`
+        """
+        windows = plan_ranges(self.config['variant_ranges'], int(self.config.get('range_merge_gap', 0)))
+        if len(windows) <= 1 or self.max_workers <= 1:
+            name_lists = [self.query_window(window) for window in windows]
+        else:
+            pool = ThreadPool(min(self.max_workers, len(windows)))
+            try:
+                name_lists = pool.map(self.query_window, windows)
+            finally:
+                pool.close()
         variant_list = []
-        for var_range in self.config['variant_ranges']:
-            variant_list.extend(self.query_variants(str(var_range['chr']), str(var_range['start']), str(var_range['end'])))
-        return variant_list
+        for names in name_lists:
+            variant_list.extend(names)
+        return unique(variant_list)
+
+    def query_window(self, window):
+        """
+        Queries the variant names of a window returned by `plan_ranges`, leaving out
+        the variants in the gaps between the requested intervals
+
+        Args:
+            window (dict): window returned by `plan_ranges`
+
+        Returns:
+            variant_list (list): list of variant names formatted in the for of `CHR:START:END`
+        """
+        variant_list = self.query_variants(window['chr'], str(window['start']), str(window['end']))
+        return [variant_name for variant_name in variant_list if in_window(window, *[int(pos) for pos in variant_name.split(':')[1:]])]
 
     def query_variants(self, chrom, start, end):
         """
         Queries the POS value of the individual variants within a range of variants.
         Returns the variable variant_name_list to the variants found within
-        this range of variants.
+        this range of variants. Follows `nextPageToken` until all the pages of the
+        search are read
 
         Args:
             chrom (str): chromosome number
@@ -82,20 +221,85 @@ class GA4GH_API:
             end (str): ending position of variant
 
         Returns: 
-            variant_name_list (list): list of variant names formatted in the for of `CHR:POS`
+            variant_name_list (list): list of variant names formatted in the for of `CHR:START:END`
         """
         variant_list = []
         req_body = {
             'datasetId' : self.dataset_id,
             'start': start,
             'end': end,
-            'referenceName': chrom
+            'referenceName': chrom,
+            'pageSize': self.page_size
         }
-        r = requests.post('%s%s' %  (self.host_url, 'variants/search'), json=req_body).json()
-        for variant in r['results']['variants']:
-            variant_list.append(':'.join([chrom, variant['start'], variant['end']]))
+        while True:
+            r = self.post('variants/search', req_body, stream=True)
+            try:
+                names, page_token = GA4GH_API.read_variant_page(r, chrom)
+            finally:
+                r.close()
+            variant_list.extend(names)
+            if not page_token:
+                break
+            req_body['pageToken'] = page_token
         return variant_list
 
+    @staticmethod
+    def read_variant_page(response, chrom):
+        """
+        Reads the variant names and the token of the next page out of a page of
+        `variants/search`. When ijson is installed only the positions of the variants
+        are kept while the response is parsed, otherwise the whole page is loaded
+
+        Args:
+            response (Response): streamed response of `variants/search`
+            chrom (str): chromosome number
+
+        Returns:
+            variant_list (list): list of variant names formatted in the for of `CHR:START:END`
+            page_token (str): token of the next page, None if it is the last page
+        """
+        variant_list = []
+        page_token = None
+        if ijson is None:
+            r = response.json()
+            for variant in r['results']['variants']:
+                variant_list.append(':'.join([chrom, str(variant['start']), str(variant['end'])]))
+            return variant_list, r['results'].get('nextPageToken') or r.get('nextPageToken')
+
+        # the positions of the variant being parsed, its keys may come in any order
+        position = {}
+        for prefix, event, value in ijson.parse(response.raw):
+            if prefix == 'results.variants.item' and event == 'start_map':
+                position = {}
+            elif prefix == 'results.variants.item' and event == 'end_map':
+                variant_list.append(':'.join([chrom, str(position.get('start')), str(position.get('end'))]))
+            elif prefix in ('results.variants.item.start', 'results.variants.item.end'):
+                position[prefix.rsplit('.', 1)[1]] = value
+            elif prefix in ('results.nextPageToken', 'nextPageToken') and value:
+                page_token = value
+        return variant_list, page_token
+
+    def count(self, req_body):
+        """
+        Posts a request body to the `count` endpoint and reads the ethnicity counts out of it
+
+        Args:
+            req_body (json): request body created by `craft_api_request`
+
+        Returns:
+            counts (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
+        """
+        r = self.post('count', req_body, stream=True)
+        try:
+            if ijson is None:
+                patients = r.json()['results']['patients'][0]
+            else:
+                patients = next(ijson.items(r.raw, 'results.patients.item'), {})
+        finally:
+            # the rest of the streamed response is not read, closing it frees the connection
+            r.close()
+        return patients.get('ethnicity', {})
+
 
     def craft_api_request(self, split_path=([], [])):
         """
@@ -160,7 +364,7 @@ class GA4GH_API:
                         "ethnicity"
                     ]
                 } ]
-        req_body['page_size'] = 10000
+        req_body['page_size'] = self.page_size
         return req_body          
 
     def get_target_set(self):
@@ -171,7 +375,7 @@ class GA4GH_API:
             counts (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
         """
         req =  self.craft_api_request()
-        ancestry_counts = requests.post('%s%s' %  (self.host_url, 'count'), json=req).json()['results']['patients'][0]['ethnicity']
+        ancestry_counts = self.count(req)
         if self.ancestry_list == []:
             self.ancestry_list = ancestry_counts.keys()
 
@@ -202,16 +406,17 @@ class GA4GH_API:
         wo_var_req_body = self.craft_api_request(wo_variant_split_path)
 
         # make query here for
-        r_w_var = requests.post('%s%s' %  (self.host_url, 'count'), json=w_var_req_body).json()['results']['patients'][0]['ethnicity']
-        r_wo_var = requests.post('%s%s' %  (self.host_url, 'count'), json=wo_var_req_body).json()['results']['patients'][0]['ethnicity']
+        r_w_var = self.count(w_var_req_body)
+        r_wo_var = self.count(wo_var_req_body)
 
         return r_w_var, r_wo_var
 
 
-    def find_next_variant_counts(self, split_path):
+    def find_next_variant_counts(self, split_path, candidates=None):
         """
         Finds the counts of the a potential next variant to perform the
-        split on
+        split on. Only the variants in `candidates` are counted, the counts
+        of the other variants are left empty
 
         Attributes:
             split_path (list1, list2): 
@@ -220,6 +425,7 @@ class GA4GH_API:
                 of the split. The direction of the second list is depicted by 1's
                 and 0's. Where 1 is splitting in the direction with the variant
                 and 0 is splitting in the direction without the variant.
+            candidates (list): indices of the variants to count, all of the variants if None
         Returns:
             w_variant_list: 
                 A list representing of a dictionary of ancestry counts per variant
@@ -231,9 +437,11 @@ class GA4GH_API:
                 ]
         """
         w_variant_list = []
+        if candidates is not None:
+            candidates = set(candidates)
 
-        for var in self.variant_name_list:
-            if var in split_path[0]:
+        for idx, var in enumerate(self.variant_name_list):
+            if var in split_path[0] or (candidates is not None and idx not in candidates):
                 w_variant_list.append({})
                 continue
 
@@ -241,9 +449,7 @@ class GA4GH_API:
             split_path[1].append(1)
 
             req_body = self.craft_api_request(split_path)
-            resp = requests.post('%s%s' %  (self.host_url, 'count'), json=req_body).json()
-            variant_counts = resp['results']['patients'][0]['ethnicity'] if 'ethnicity' in resp['results']['patients'][0] else {}
-            w_variant_list.append(variant_counts)
+            w_variant_list.append(self.count(req_body))
 
             del split_path[0][-1]
             del split_path[1][-1]
@@ -1,200 +0,0 @@
-ga4gh_repo add-variantset -I ../../samples/HG00096.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00096 HG00096_chr22 ../../samples/HG00096.vcf.gz
-echo "0th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00097.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00097 HG00097_chr22 ../../samples/HG00097.vcf.gz
-echo "1th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00099.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00099 HG00099_chr22 ../../samples/HG00099.vcf.gz
-echo "2th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00100.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00100 HG00100_chr22 ../../samples/HG00100.vcf.gz
-echo "3th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00101.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00101 HG00101_chr22 ../../samples/HG00101.vcf.gz
-echo "4th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00102.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00102 HG00102_chr22 ../../samples/HG00102.vcf.gz
-echo "5th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00103.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00103 HG00103_chr22 ../../samples/HG00103.vcf.gz
-echo "6th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00105.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00105 HG00105_chr22 ../../samples/HG00105.vcf.gz
-echo "7th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00106.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00106 HG00106_chr22 ../../samples/HG00106.vcf.gz
-echo "8th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00107.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00107 HG00107_chr22 ../../samples/HG00107.vcf.gz
-echo "9th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00108.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00108 HG00108_chr22 ../../samples/HG00108.vcf.gz
-echo "10th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00109.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00109 HG00109_chr22 ../../samples/HG00109.vcf.gz
-echo "11th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00110.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00110 HG00110_chr22 ../../samples/HG00110.vcf.gz
-echo "12th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00111.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00111 HG00111_chr22 ../../samples/HG00111.vcf.gz
-echo "13th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00112.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00112 HG00112_chr22 ../../samples/HG00112.vcf.gz
-echo "14th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00113.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00113 HG00113_chr22 ../../samples/HG00113.vcf.gz
-echo "15th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00114.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00114 HG00114_chr22 ../../samples/HG00114.vcf.gz
-echo "16th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00115.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00115 HG00115_chr22 ../../samples/HG00115.vcf.gz
-echo "17th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00116.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00116 HG00116_chr22 ../../samples/HG00116.vcf.gz
-echo "18th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00117.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00117 HG00117_chr22 ../../samples/HG00117.vcf.gz
-echo "19th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00118.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00118 HG00118_chr22 ../../samples/HG00118.vcf.gz
-echo "20th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00119.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00119 HG00119_chr22 ../../samples/HG00119.vcf.gz
-echo "21th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00120.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00120 HG00120_chr22 ../../samples/HG00120.vcf.gz
-echo "22th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00121.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00121 HG00121_chr22 ../../samples/HG00121.vcf.gz
-echo "23th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00122.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00122 HG00122_chr22 ../../samples/HG00122.vcf.gz
-echo "24th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00123.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00123 HG00123_chr22 ../../samples/HG00123.vcf.gz
-echo "25th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00125.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00125 HG00125_chr22 ../../samples/HG00125.vcf.gz
-echo "26th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00126.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00126 HG00126_chr22 ../../samples/HG00126.vcf.gz
-echo "27th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00127.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00127 HG00127_chr22 ../../samples/HG00127.vcf.gz
-echo "28th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00128.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00128 HG00128_chr22 ../../samples/HG00128.vcf.gz
-echo "29th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00129.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00129 HG00129_chr22 ../../samples/HG00129.vcf.gz
-echo "30th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00130.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00130 HG00130_chr22 ../../samples/HG00130.vcf.gz
-echo "31th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00131.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00131 HG00131_chr22 ../../samples/HG00131.vcf.gz
-echo "32th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00132.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00132 HG00132_chr22 ../../samples/HG00132.vcf.gz
-echo "33th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00133.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00133 HG00133_chr22 ../../samples/HG00133.vcf.gz
-echo "34th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00136.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00136 HG00136_chr22 ../../samples/HG00136.vcf.gz
-echo "35th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00137.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00137 HG00137_chr22 ../../samples/HG00137.vcf.gz
-echo "36th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00138.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00138 HG00138_chr22 ../../samples/HG00138.vcf.gz
-echo "37th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00139.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00139 HG00139_chr22 ../../samples/HG00139.vcf.gz
-echo "38th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00140.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00140 HG00140_chr22 ../../samples/HG00140.vcf.gz
-echo "39th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00141.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00141 HG00141_chr22 ../../samples/HG00141.vcf.gz
-echo "40th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00142.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00142 HG00142_chr22 ../../samples/HG00142.vcf.gz
-echo "41th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00143.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00143 HG00143_chr22 ../../samples/HG00143.vcf.gz
-echo "42th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00145.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00145 HG00145_chr22 ../../samples/HG00145.vcf.gz
-echo "43th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00146.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00146 HG00146_chr22 ../../samples/HG00146.vcf.gz
-echo "44th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00148.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00148 HG00148_chr22 ../../samples/HG00148.vcf.gz
-echo "45th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00149.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00149 HG00149_chr22 ../../samples/HG00149.vcf.gz
-echo "46th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00150.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00150 HG00150_chr22 ../../samples/HG00150.vcf.gz
-echo "47th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00151.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00151 HG00151_chr22 ../../samples/HG00151.vcf.gz
-echo "48th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00154.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00154 HG00154_chr22 ../../samples/HG00154.vcf.gz
-echo "49th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00155.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00155 HG00155_chr22 ../../samples/HG00155.vcf.gz
-echo "50th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00157.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00157 HG00157_chr22 ../../samples/HG00157.vcf.gz
-echo "51th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00158.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00158 HG00158_chr22 ../../samples/HG00158.vcf.gz
-echo "52th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00159.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00159 HG00159_chr22 ../../samples/HG00159.vcf.gz
-echo "53th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00160.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00160 HG00160_chr22 ../../samples/HG00160.vcf.gz
-echo "54th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00171.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00171 HG00171_chr22 ../../samples/HG00171.vcf.gz
-echo "55th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00173.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00173 HG00173_chr22 ../../samples/HG00173.vcf.gz
-echo "56th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00174.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00174 HG00174_chr22 ../../samples/HG00174.vcf.gz
-echo "57th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00176.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00176 HG00176_chr22 ../../samples/HG00176.vcf.gz
-echo "58th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00177.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00177 HG00177_chr22 ../../samples/HG00177.vcf.gz
-echo "59th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00178.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00178 HG00178_chr22 ../../samples/HG00178.vcf.gz
-echo "60th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00179.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00179 HG00179_chr22 ../../samples/HG00179.vcf.gz
-echo "61th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00180.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00180 HG00180_chr22 ../../samples/HG00180.vcf.gz
-echo "62th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00181.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00181 HG00181_chr22 ../../samples/HG00181.vcf.gz
-echo "63th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00182.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00182 HG00182_chr22 ../../samples/HG00182.vcf.gz
-echo "64th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00183.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00183 HG00183_chr22 ../../samples/HG00183.vcf.gz
-echo "65th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00185.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00185 HG00185_chr22 ../../samples/HG00185.vcf.gz
-echo "66th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00186.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00186 HG00186_chr22 ../../samples/HG00186.vcf.gz
-echo "67th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00187.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00187 HG00187_chr22 ../../samples/HG00187.vcf.gz
-echo "68th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00188.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00188 HG00188_chr22 ../../samples/HG00188.vcf.gz
-echo "69th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00189.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00189 HG00189_chr22 ../../samples/HG00189.vcf.gz
-echo "70th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00190.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00190 HG00190_chr22 ../../samples/HG00190.vcf.gz
-echo "71th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00231.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00231 HG00231_chr22 ../../samples/HG00231.vcf.gz
-echo "72th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00232.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00232 HG00232_chr22 ../../samples/HG00232.vcf.gz
-echo "73th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00233.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00233 HG00233_chr22 ../../samples/HG00233.vcf.gz
-echo "74th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00234.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00234 HG00234_chr22 ../../samples/HG00234.vcf.gz
-echo "75th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00235.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00235 HG00235_chr22 ../../samples/HG00235.vcf.gz
-echo "76th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00236.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00236 HG00236_chr22 ../../samples/HG00236.vcf.gz
-echo "77th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00237.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00237 HG00237_chr22 ../../samples/HG00237.vcf.gz
-echo "78th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00238.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00238 HG00238_chr22 ../../samples/HG00238.vcf.gz
-echo "79th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00239.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00239 HG00239_chr22 ../../samples/HG00239.vcf.gz
-echo "80th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00240.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00240 HG00240_chr22 ../../samples/HG00240.vcf.gz
-echo "81th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00242.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00242 HG00242_chr22 ../../samples/HG00242.vcf.gz
-echo "82th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00243.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00243 HG00243_chr22 ../../samples/HG00243.vcf.gz
-echo "83th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00244.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00244 HG00244_chr22 ../../samples/HG00244.vcf.gz
-echo "84th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00245.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00245 HG00245_chr22 ../../samples/HG00245.vcf.gz
-echo "85th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00246.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00246 HG00246_chr22 ../../samples/HG00246.vcf.gz
-echo "86th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00250.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00250 HG00250_chr22 ../../samples/HG00250.vcf.gz
-echo "87th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00251.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00251 HG00251_chr22 ../../samples/HG00251.vcf.gz
-echo "88th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00252.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00252 HG00252_chr22 ../../samples/HG00252.vcf.gz
-echo "89th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00253.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00253 HG00253_chr22 ../../samples/HG00253.vcf.gz
-echo "90th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00254.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00254 HG00254_chr22 ../../samples/HG00254.vcf.gz
-echo "91th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00255.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00255 HG00255_chr22 ../../samples/HG00255.vcf.gz
-echo "92th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00256.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00256 HG00256_chr22 ../../samples/HG00256.vcf.gz
-echo "93th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00257.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00257 HG00257_chr22 ../../samples/HG00257.vcf.gz
-echo "94th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00258.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00258 HG00258_chr22 ../../samples/HG00258.vcf.gz
-echo "95th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00259.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00259 HG00259_chr22 ../../samples/HG00259.vcf.gz
-echo "96th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00260.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00260 HG00260_chr22 ../../samples/HG00260.vcf.gz
-echo "97th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00261.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00261 HG00261_chr22 ../../samples/HG00261.vcf.gz
-echo "98th variantset ingested"
-ga4gh_repo add-variantset -I ../../samples/HG00262.vcf.gz.tbi -R GRCh37-lite registry.db 1kgenome HG00262 HG00262_chr22 ../../samples/HG00262.vcf.gz
-echo "99th variantset ingested"
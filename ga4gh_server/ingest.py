@@ -0,0 +1,237 @@
+"""
+Ingests the sample VCFs into the registry of the ga4gh_server
+
+Every `HG*.vcf.gz` in the samples directory is indexed with tabix if it has no up to
+date `.tbi` and is added to the dataset with `ga4gh_repo add-variantset`. Files are
+handled by a pool of worker threads, the indexing runs concurrently while the calls
+to `ga4gh_repo` are serialized since they all write to the same registry database.
+
+A manifest of the ingested files is kept next to the registry so that a rerun only
+ingests files that are new or that changed since they were ingested, which also allows
+a failed ingest to be resumed. A registry filled before the manifest was kept is
+recorded with `--seed-manifest` first, otherwise every one of its files is added again.
+
+Example (from the directory of registry.db):
+    python ../../ingest.py --samples-dir ../../samples registry.db 1kgenome
+"""
+import os
+import sys
+import glob
+import json
+import shlex
+import argparse
+import subprocess
+import threading
+from multiprocessing.pool import ThreadPool
+
+class Ingest:
+
+    def __init__(self, registry, dataset, samples_dir, pattern='HG*.vcf.gz', reference_set='GRCh37-lite',
+                 name_suffix='_chr22', repo_cmd='ga4gh_repo', manifest_path=None, workers=4, serialize=True):
+        """
+        Args:
+            registry (str): path to the registry database
+            dataset (str): name of the dataset the variant sets are added to
+            samples_dir (str): directory of the sample VCFs
+            pattern (str): glob pattern of the sample VCFs within `samples_dir`
+            reference_set (str): name of the reference set of the variant sets
+            name_suffix (str): suffix appended to the sample id to name its variant set
+            repo_cmd (str): command used to run `ga4gh_repo`, e.g. a local stand-in
+            manifest_path (str): path of the manifest, `<registry>.manifest.json` if None
+            workers (int): number of files handled concurrently
+            serialize (bool): runs one `ga4gh_repo` command at a time
+
+        Attributes:
+            manifest (dict): ingested VCF paths mapped to their size, modification time and variant set
+        """
+        self.registry = registry
+        self.dataset = dataset
+        self.samples_dir = samples_dir
+        self.pattern = pattern
+        self.reference_set = reference_set
+        self.name_suffix = name_suffix
+        self.repo_cmd = shlex.split(repo_cmd)
+        self.manifest_path = manifest_path or '%s.manifest.json' % registry
+        self.workers = workers
+        self.serialize = serialize
+
+        self.repo_lock = threading.Lock()
+        self.manifest_lock = threading.Lock()
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+    @staticmethod
+    def file_state(vcf_path):
+        stat = os.stat(vcf_path)
+        return {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+    def discover(self):
+        """
+        Finds the sample VCFs that are not in the manifest or that changed since they were ingested
+
+        Returns:
+            (list): absolute paths of the VCFs to ingest
+        """
+        pending = []
+        for vcf_path in sorted(glob.glob(os.path.join(self.samples_dir, self.pattern))):
+            vcf_path = os.path.abspath(vcf_path)
+            entry = self.manifest.get(vcf_path)
+            if entry is None or entry['size'] != os.path.getsize(vcf_path) or entry['mtime'] != int(os.path.getmtime(vcf_path)):
+                pending.append(vcf_path)
+        return pending
+
+    @staticmethod
+    def index(vcf_path):
+        """
+        Creates the tabix index of a VCF if it is missing or older than the VCF
+
+        Args:
+            vcf_path (str): path of the bgzipped VCF
+
+        Returns:
+            index_path (str): path of the index
+        """
+        index_path = '%s.tbi' % vcf_path
+        if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(vcf_path):
+            return index_path
+        try:
+            import pysam
+        except ImportError:
+            subprocess.check_call(['tabix', '-f', '-p', 'vcf', vcf_path])
+        else:
+            pysam.tabix_index(vcf_path, preset='vcf', force=True)
+        return index_path
+
+    def run_repo(self, *args):
+        """
+        Runs a `ga4gh_repo` command, one at a time if the registry access is serialized
+        """
+        cmd = self.repo_cmd + [str(arg) for arg in args]
+        if not self.serialize:
+            subprocess.check_call(cmd)
+            return
+        with self.repo_lock:
+            subprocess.check_call(cmd)
+
+    def save_manifest(self):
+        tmp_path = '%s.tmp' % self.manifest_path
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.rename(tmp_path, self.manifest_path)
+
+    def ingest_file(self, vcf_path):
+        """
+        Indexes a sample VCF and adds it to the registry as a variant set, replacing the
+        variant set ingested from an older version of the file. The manifest is updated
+        as soon as the file is ingested
+
+        Args:
+            vcf_path (str): absolute path of the sample VCF
+
+        Returns:
+            (tuple): the path of the VCF and the error message, None if it was ingested
+        """
+        sample = os.path.basename(vcf_path).split('.')[0]
+        variant_set = '%s%s' % (sample, self.name_suffix)
+        try:
+            state = Ingest.file_state(vcf_path)
+            index_path = Ingest.index(vcf_path)
+            if vcf_path in self.manifest:
+                self.run_repo('remove-variantset', '-f', self.registry, self.dataset, self.manifest[vcf_path]['variant_set'])
+                # the old variant set is gone, a rerun has to add the file rather than remove it again
+                self.update_manifest(vcf_path, None)
+            self.run_repo('add-variantset', '-I', index_path, '-R', self.reference_set,
+                          self.registry, self.dataset, sample, variant_set, vcf_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            return vcf_path, str(e)
+
+        state['variant_set'] = variant_set
+        self.update_manifest(vcf_path, state)
+        return vcf_path, None
+
+    def update_manifest(self, vcf_path, state):
+        """
+        Records the state of an ingested VCF in the manifest and saves it right away
+
+        Args:
+            vcf_path (str): absolute path of the sample VCF
+            state (dict): state of the file from `file_state` with its `variant_set`,
+                          None to remove the file from the manifest
+        """
+        with self.manifest_lock:
+            if state is None:
+                self.manifest.pop(vcf_path, None)
+            else:
+                self.manifest[vcf_path] = state
+            self.save_manifest()
+
+    def seed(self):
+        """
+        Records every sample VCF as ingested without running `ga4gh_repo`, for a registry
+        whose variant sets were added before the manifest was kept (e.g. by the old
+        `1kgenome_ingest.sh`). Files that change afterwards are ingested again as usual
+
+        Returns:
+            (int): number of files recorded
+        """
+        pending = self.discover()
+        with self.manifest_lock:
+            for vcf_path in pending:
+                state = Ingest.file_state(vcf_path)
+                state['variant_set'] = '%s%s' % (os.path.basename(vcf_path).split('.')[0], self.name_suffix)
+                self.manifest[vcf_path] = state
+            self.save_manifest()
+        return len(pending)
+
+    def run(self):
+        """
+        Ingests all of the new or changed sample VCFs
+
+        Returns:
+            failed (list): (path, error message) of the VCFs that could not be ingested
+        """
+        pending = self.discover()
+        print("%s variantsets to ingest" % len(pending))
+        failed = []
+        if not pending:
+            return failed
+        pool = ThreadPool(max(1, min(self.workers, len(pending))))
+        try:
+            for done, (vcf_path, error) in enumerate(pool.imap_unordered(self.ingest_file, pending)):
+                if error:
+                    failed.append((vcf_path, error))
+                    print("failed to ingest %s: %s" % (vcf_path, error))
+                else:
+                    print("%s/%s variantsets ingested (%s)" % (done + 1, len(pending), os.path.basename(vcf_path)))
+        finally:
+            pool.close()
+            pool.join()
+        return failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Ingests sample VCFs into the registry of the ga4gh_server')
+    parser.add_argument('registry', help='path to the registry database, e.g. registry.db')
+    parser.add_argument('dataset', help='name of the dataset, e.g. 1kgenome')
+    parser.add_argument('--samples-dir', default='samples', help='directory of the sample VCFs')
+    parser.add_argument('--pattern', default='HG*.vcf.gz', help='glob pattern of the sample VCFs')
+    parser.add_argument('--reference-set', default='GRCh37-lite')
+    parser.add_argument('--name-suffix', default='_chr22', help='suffix of the variant set names')
+    parser.add_argument('--repo-cmd', default='ga4gh_repo', help='command used to run ga4gh_repo')
+    parser.add_argument('--manifest', default=None, help='path of the manifest of ingested files')
+    parser.add_argument('--workers', type=int, default=4, help='number of files handled concurrently')
+    parser.add_argument('--parallel-register', action='store_true',
+                        help='run ga4gh_repo commands concurrently (only if the registry allows it)')
+    parser.add_argument('--seed-manifest', action='store_true',
+                        help='record the sample VCFs as already ingested without running ga4gh_repo')
+    args = parser.parse_args()
+
+    ingest = Ingest(args.registry, args.dataset, args.samples_dir, pattern=args.pattern,
+                    reference_set=args.reference_set, name_suffix=args.name_suffix,
+                    repo_cmd=args.repo_cmd, manifest_path=args.manifest, workers=args.workers,
+                    serialize=not args.parallel_register)
+    if args.seed_manifest:
+        print("%s variantsets recorded as ingested" % ingest.seed())
+        sys.exit(0)
+    sys.exit(1 if ingest.run() else 0)
@@ -1,8 +1,37 @@
 import vcf
 import json
+import numpy as np
+from array import array
+from range_planner import plan_ranges, in_window
+
+def is_carrier(alleles):
+    """
+    Checks if a person has a variant given its genotype, the definition shared by every
+    reader of genotypes (LOCAL_API, BatchPredictor and SNAPSHOT_API): the genotype is
+    called, none of its alleles is missing, and it is not homozygous reference. Phasing
+    doesn't matter, `0|1` and `0/1` both have the variant and `0/0` doesn't
+
+    Args:
+        alleles (list): allele indices of the genotype, the strings of PyVCF's `gt_alleles`
+                        or the integers of a GA4GH `genotype`. A missing allele is None
+                        (PyVCF's `.`) or -1 (GA4GH)
+
+    Returns:
+        (bool): True if the person has the variant
+    """
+    if not alleles:
+        return False
+    called = True
+    non_reference = False
+    for allele in alleles:
+        if allele is None or allele == -1 or allele == '.':
+            called = False
+        elif allele != '0' and allele != 0:
+            non_reference = True
+    return called and non_reference
 
 class LOCAL_API:
-    def __init__(self, file_path, conf_matrix=False):
+    def __init__(self, file_path, conf_matrix=False, shard=None, config=None):
         """
         Initializes the API class
 
@@ -13,23 +42,41 @@ class LOCAL_API:
         Args:
             file_path (str): Path to json file that contains the variant rangess
             conf_matrix (bool): Initializes API to perform conf_matrix operations
+            shard (tuple): (index, count) to only load the individuals of one of `count`
+                           disjoint shards, the individuals in the VCF columns where
+                           `column % count == index`
+            config (dict): config to use instead of the one at `file_path`
 
         Attributes:
             variant_list (list): Represents the variants in each person. 
                                      The value of the variants is a list of 0's and 
                                      1's indicating if the variant exists in the person.
+                                     Empty with the sparse storage, see `columns`
             indiv_list (list): Represents the individual code of a person
             popu_list (list): Represents the ancestry of the person
             variant_name_list (list): Names of the variants in the format of
                                           "VARIANT_POS,VARIANT_REF,VARIANT_ALT"
                                           "CHROMOSOME_#:START_POS:END_POS" (TODO - UPDATE TO THIS)
+            variant_spans (list): 0-based (start, end) of the reference allele of every variant,
+                                  the span the variant was fetched by
             ancestry_dict (dict): a dictionary which maps indivdual ID to population
             ancestry_list (list): A unique list of all the ancestries of people
             is_conf_matrix (bool): tells API to initialize the API for confusion matrix operations
+            shard (tuple): the shard of individuals loaded, None if all are loaded
+            storage (str): `dense` to keep a row of 0's and 1's per person (the default) or
+                           `sparse` to keep a column per variant (`storage` in the config)
+            columns (list): with the sparse storage, the people with each variant. A variant
+                            carried by at most `sparse_density` (in the config, default 0.1) of
+                            the people keeps a sorted numpy array of the indices of its carriers,
+                            other variants keep a boolean numpy array of every person
+            popu_codes (numpy.ndarray): with the sparse storage, index in ancestry_list of the
+                                        ancestry of every person
 
         """
-        with open(file_path) as f:
-            self.config = json.load(f)
+        if config is None:
+            with open(file_path) as f:
+                config = json.load(f)
+        self.config = config
         self.variant_list = []
         self.indiv_list = []
         self.popu_list = []
@@ -38,34 +85,59 @@ class LOCAL_API:
         self.test_variant_list = []
 
         self.variant_name_list = []
+        self.variant_spans = []
         self.ancestry_dict = {}
         self.ancestry_list = []
 
         self.is_conf_matrix = conf_matrix
+        self.shard = shard
+        self.storage = self.config.get('storage', 'dense')
+        self.columns = []
+        self.popu_codes = []
+        self.variant_index = {}
 
         # fetch variants from vcf and create a dictionary
-        variants = self.fetch_variants()
-        variant_dict = self.create_variant_dict(variants)
+        variant_dict = self.load_variant_dict()
 
         # updates variables
         self.read_user_mappings(variant_dict)
+        if self.storage == 'sparse':
+            self.build_columns(float(self.config.get('sparse_density', 0.1)))
 
-    def fetch_variants(self):
+    def load_variant_dict(self):
         """
-        Fetches the variants from the 1000 genomes VCF files and loads them into a variant_list
+        Loads the variants of the people, see `create_variant_dict`
 
-        Args:
-            file_path (str): Path to json file that contains the variant rangess
+        Returns:
+            variant_dict (dict): A dictionary where the
+                                    key: is the individual ID
+                                    value: is the list of variants of the person
+        """
+        variants = self.fetch_variants()
+        return self.create_variant_dict(variants)
+
+    def fetch_variants(self):
+        """
+        Fetches the variants from the 1000 genomes VCF files and loads them into a variant_list.
+        The variant ranges are planned with `plan_ranges` first so every region is read once,
+        one chromosome file at a time in sorted order
 
         Returns:
-            variant_list (list): a list of variants from the VCF file
+            variant_list (list): a list of variants from the VCF file without repeated variants
         """
         variant_list = []
-        for var_range in self.config['variant_ranges']:
-            vcf_path = self.config['chr_paths'][str(var_range['chr'])]
-            vcf_reader = vcf.Reader(open(str(vcf_path), 'r'))
-            variants = vcf_reader.fetch(int(var_range['chr']), int(var_range['start']), int(var_range['end']))
-            variant_list.extend([variant for variant in variants])
+        seen = set()
+        vcf_readers = {}
+        for window in plan_ranges(self.config['variant_ranges'], int(self.config.get('range_merge_gap', 0))):
+            if window['chr'] not in vcf_readers:
+                vcf_path = self.config['chr_paths'][window['chr']]
+                vcf_readers[window['chr']] = vcf.Reader(open(str(vcf_path), 'r'))
+            for variant in vcf_readers[window['chr']].fetch(window['chr'], window['start'], window['end']):
+                variant_name = ':'.join([str(variant.CHROM), str(variant.POS-1), str(variant.POS)])
+                if variant_name in seen or not in_window(window, variant.start, variant.end):
+                    continue
+                seen.add(variant_name)
+                variant_list.append(variant)
         return variant_list
 
     @staticmethod
@@ -109,6 +181,8 @@ class LOCAL_API:
                                     key: is the individual ID
                                     value: is a list of binary values where
                                            (1 = variant exists, 0 = variant doesn't exist)
+                                           or with the sparse storage, the list of the
+                                           indices of the variants the person has
         """
         variant_dict = {}
         variant_name_list = []
@@ -117,34 +191,49 @@ class LOCAL_API:
         for variant in variants:
             idx += 1
             self.variant_name_list.append(':'.join([str(variant.CHROM), str(variant.POS-1), str(variant.POS)]))
+            self.variant_spans.append((variant.start, variant.end))
             # loops through people in variants
-            for call in variant.samples:
+            for column, call in enumerate(variant.samples):
+                # skips people of other shards
+                if self.shard and column % self.shard[1] != self.shard[0]:
+                    continue
                 variant_dict[call.sample] = variant_dict.get(call.sample, [])
                 # checks if variant exists in person
-                if call['GT'] == '0|0':
-                    variant_dict[call.sample].append(0)
-                else:
+                carrier = is_carrier(call.gt_alleles)
+                if self.storage == 'sparse':
+                    if carrier:
+                        variant_dict[call.sample].append(idx - 1)
+                elif carrier:
                     variant_dict[call.sample].append(1)
+                else:
+                    variant_dict[call.sample].append(0)
         return variant_dict
 
-    def read_user_mappings(self, variant_dict):
+    def read_ancestries(self):
         """
-        Reads the usermappings from a file and updates the variables in the class
+        Reads the usermappings from the `.ped` file
+
+        Returns:
+            (generator): (individual ID, population) of every person in the file
         """
         with open(self.config['user_mapping_path']) as file:
             next(file)
             for line in file:
                 split_line = line.split('\t')
-                indiv_id = split_line[1]
-                population = split_line[6]
+                yield split_line[1], split_line[6]
 
-                self.ancestry_dict[indiv_id] = population
+    def read_user_mappings(self, variant_dict):
+        """
+        Reads the usermappings from a file and updates the variables in the class
+        """
+        for indiv_id, population in self.read_ancestries():
+            self.ancestry_dict[indiv_id] = population
 
-                # checks if variant individual is in the variant dict from the vcf file
-                if indiv_id in variant_dict:
-                    self.indiv_list.append(indiv_id)
-                    self.popu_list.append(population)
-                    self.variant_list.append(variant_dict[indiv_id])
+            # checks if variant individual is in the variant dict from the vcf file
+            if indiv_id in variant_dict:
+                self.indiv_list.append(indiv_id)
+                self.popu_list.append(population)
+                self.variant_list.append(variant_dict[indiv_id])
 
         self.ancestry_list = list(set(self.ancestry_dict.values()))
 
@@ -155,6 +244,97 @@ class LOCAL_API:
             self.variant_list = self.variant_list[::2]
             self.popu_list = self.popu_list[::2]
 
+    def build_columns(self, sparse_density):
+        """
+        Turns the rows of variant indices of the people into a column per variant, the
+        sorted indices of the carriers for variants carried by at most `sparse_density`
+        of the people and a boolean array of every person for the others. The rows are
+        dropped afterwards
+
+        Args:
+            sparse_density (float): highest fraction of carriers stored as a list of carriers
+        """
+        carriers = [array('i') for variant_name in self.variant_name_list]
+        for row, variants in enumerate(self.variant_list):
+            for var_idx in variants:
+                carriers[var_idx].append(row)
+
+        row_count = len(self.variant_list)
+        self.columns = []
+        for column in carriers:
+            column = np.array(column, dtype=np.int32)
+            if row_count and len(column) / float(row_count) > sparse_density:
+                dense = np.zeros(row_count, dtype=bool)
+                dense[column] = True
+                column = dense
+            self.columns.append(column)
+
+        ancestry_codes = dict((ancestry, code) for code, ancestry in enumerate(self.ancestry_list))
+        self.popu_codes = np.array([ancestry_codes[popu] for popu in self.popu_list], dtype=np.intp)
+        self.variant_index = dict((variant_name, idx) for idx, variant_name in enumerate(self.variant_name_list))
+        self.variant_list = []
+
+    def find_rows(self, split_path):
+        """
+        Finds the rows of the people on a split path with the sparse storage
+
+        Args:
+            split_path (list1, list2): 
+                This is the paths of the splits before the current split. The first list
+                is the list of variant names and the second list is the direction
+                of the split. The direction of the second list is depicted by 1's
+                and 0's. Where 1 is splitting in the direction with the variant
+                and 0 is splitting in the direction without the variant.
+
+        Returns:
+            rows (numpy.ndarray): boolean mask of the people on the split path
+        """
+        rows = np.ones(len(self.popu_codes), dtype=bool)
+        for exc_var, direction in zip(split_path[0], split_path[1]):
+            column = self.columns[self.variant_index[exc_var]]
+            if column.dtype != bool:
+                carriers = column
+                column = np.zeros(len(rows), dtype=bool)
+                column[carriers] = True
+            if direction:
+                rows &= column
+            else:
+                rows &= ~column
+        return rows
+
+    def count_column(self, column, rows):
+        """
+        Counts the ancestries of the carriers of a variant among some rows with the sparse
+        storage. The carriers of a carrier list are intersected with the rows by looking
+        them up in the mask, so the work is proportional to the number of carriers
+
+        Args:
+            column (numpy.ndarray): column of the variant in `columns`
+            rows (numpy.ndarray): boolean mask of the people to count, see `find_rows`
+
+        Returns:
+            counts (list): number of carriers of every ancestry in ancestry_list
+        """
+        if column.dtype == bool:
+            carriers = column & rows
+        else:
+            carriers = column[rows[column]]
+        return np.bincount(self.popu_codes[carriers], minlength=len(self.ancestry_list)).tolist()
+
+    def row_variant_names(self, variants):
+        """
+        Gets the names of the variants of a row of variant_list or test_variant_list
+
+        Args:
+            variants (list): a row of 0's and 1's, or of variant indices with the sparse storage
+
+        Returns:
+            (list): names of the variants the person has
+        """
+        if self.storage == 'sparse':
+            return [self.variant_name_list[idx] for idx in variants]
+        return [self.variant_name_list[idx] for idx, is_variant in enumerate(variants) if is_variant == 1]
+
 
     def find_ignore_rows(self, split_path):
         """
@@ -213,6 +393,14 @@ class LOCAL_API:
         # retrieves variant from "API"
         ancestry_list = self.ancestry_list
 
+        if self.storage == 'sparse':
+            if not split_var:
+                return dict.fromkeys(ancestry_list, 0), dict.fromkeys(ancestry_list, 0)
+            rows = self.find_rows(split_path)
+            totals = np.bincount(self.popu_codes[rows], minlength=len(ancestry_list)).tolist()
+            w_counts = self.count_column(self.columns[self.variant_index[split_var]], rows)
+            return dict(zip(ancestry_list, w_counts)), dict(zip(ancestry_list, [total - w for total, w in zip(totals, w_counts)]))
+
         w_variant_dict = dict.fromkeys(ancestry_list, 0)
         wo_variant_dict = dict.fromkeys(ancestry_list, 0)
 
@@ -233,10 +421,11 @@ class LOCAL_API:
 
         return w_variant_dict, wo_variant_dict
 
-    def find_next_variant_counts(self, split_path):
+    def find_next_variant_counts(self, split_path, candidates=None):
         """
         Finds the counts of the a potential next variant to perform the
-        split on
+        split on. Only the variants in `candidates` are counted, the counts
+        of the other variants are left empty
 
         Attributes:
             split_path (list1, list2): 
@@ -245,6 +434,7 @@ class LOCAL_API:
                 of the split. The direction of the second list is depicted by 1's
                 and 0's. Where 1 is splitting in the direction with the variant
                 and 0 is splitting in the direction without the variant.
+            candidates (list): indices of the variants to count, all of the variants if None
         Returns:
             w_variant_list: 
                 A list representing of a dictionary of ancestry counts per variant
@@ -256,16 +446,27 @@ class LOCAL_API:
                 ]
         """
         ancestry_list = self.ancestry_list
-        w_variant_list = [dict.fromkeys(ancestry_list, 0) for variant_names in self.variant_name_list]
-        ignore_rows_idxs = self.find_ignore_rows(split_path)
+        if candidates is None:
+            candidates = range(len(self.variant_name_list))
+        w_variant_list = [{} for variant_names in self.variant_name_list]
+        for idx2 in candidates:
+            w_variant_list[idx2] = dict.fromkeys(ancestry_list, 0)
+
+        if self.storage == 'sparse':
+            rows = self.find_rows(split_path)
+            for idx2 in candidates:
+                w_variant_list[idx2] = dict(zip(ancestry_list, self.count_column(self.columns[idx2], rows)))
+            return w_variant_list
+
+        ignore_rows_idxs = set(self.find_ignore_rows(split_path))
 
         for idx, variants in enumerate(self.variant_list):
             if idx in ignore_rows_idxs:
                 continue
             popu = self.popu_list[idx]
-            # find counts of variants
-            for idx2, variant in enumerate(variants):
-                if variant is 1:
+            # find counts of candidate variants
+            for idx2 in candidates:
+                if variants[idx2] is 1:
                     w_variant_list[idx2][popu] += 1
 
         return w_variant_list
@@ -288,6 +489,12 @@ class LOCAL_API:
         Gets the counts of each variant
         """
         my_dict = {}
+        if self.storage == 'sparse':
+            for idx, column in enumerate(self.columns):
+                count = int(column.sum()) if column.dtype == bool else len(column)
+                if count:
+                    my_dict[self.variant_name_list[idx]] = count
+            return my_dict
         for variants in (self.variant_list):
             count = 0
             for idx, variant in enumerate(variants):
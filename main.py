@@ -3,6 +3,9 @@ from ID3_Class import ID3
 # Creates ID3 object with a filepath to the config.json
 id3_obj = ID3('config.json', local=False)
 
+# trains the tree (otherwise done on the first call to `predict` or `print_tree`)
+id3_obj.train()
+
 # prints the ID3 tree as `tree.png`
 id3_obj.print_tree('tree')
 
@@ -0,0 +1,151 @@
+import os
+import json
+import argparse
+from multiprocessing import Pool
+from ID3_Class import ID3
+from range_planner import plan_ranges, in_window
+
+# cohort shared with the worker processes of `train_panels`, which inherit it when forked
+_cohort = None
+
+class PANEL_API:
+    def __init__(self, cohort, panel):
+        """
+        A view of a loaded cohort that only exposes the variants of one panel. The view
+        keeps the indices of the panel's variants in the cohort and translates them on every
+        request, the genotypes of the cohort are not copied
+
+        Args:
+            cohort (LOCAL_API): API loaded with the variants of all of the panels
+            panel (dict): panel with a `name` and `variant_ranges` in the config format
+
+        Attributes:
+            config (dict): config of the cohort with the variant ranges of the panel
+            columns (list): index in the cohort of every variant of the panel
+            variant_name_list (list): Names of the variants of the panel
+            ancestry_list (list): A unique list of all the ancestries of people
+        """
+        self.cohort = cohort
+        self.name = panel['name']
+        self.config = dict(cohort.config, variant_ranges=panel['variant_ranges'])
+        windows = plan_ranges(panel['variant_ranges'], int(cohort.config.get('range_merge_gap', 0)))
+        self.columns = [idx for idx, variant_name in enumerate(cohort.variant_name_list)
+                        if PANEL_API.in_panel(windows, variant_name.split(':')[0], *cohort.variant_spans[idx])]
+        self.variant_name_list = [cohort.variant_name_list[idx] for idx in self.columns]
+        self.ancestry_list = cohort.ancestry_list
+
+    @staticmethod
+    def in_panel(windows, chrom, start, end):
+        """
+        Checks if a variant would be read by a standalone tree of the panel: it is fetched
+        with one of the windows of the panel (its span overlaps the window) and
+        `in_window` keeps it
+
+        Args:
+            windows (list): ranges of the panel planned by `plan_ranges`
+            chrom (str): chromosome of the variant
+            start (int): 0-based start position of the variant
+            end (int): 0-based end position (exclusive) of the variant
+
+        Returns:
+            (bool): whether the variant is in the panel
+        """
+        return any(window['chr'] == chrom and window['start'] < max(end, start + 1) and start < window['end']
+                   and in_window(window, start, end) for window in windows)
+
+    def get_target_set(self):
+        return self.cohort.get_target_set()
+
+    def split_subset(self, node, split_var=None):
+        return self.cohort.split_subset(node, split_var)
+
+    def find_next_variant_counts(self, split_path, candidates=None):
+        """
+        Finds the counts of the potential next variants of the panel, see
+        `LOCAL_API.find_next_variant_counts`
+
+        Returns:
+            w_variant_list: A list of the ancestry counts of every variant of the panel
+        """
+        if candidates is None:
+            candidates = range(len(self.columns))
+        w_variant_list = self.cohort.find_next_variant_counts(split_path, [self.columns[idx] for idx in candidates])
+        return [w_variant_list[column] for column in self.columns]
+
+def load_cohort(file_path, panels, conf_matrix=False):
+    """
+    Loads the individuals once with the variants of the union of the ranges of all of the panels
+
+    Args:
+        file_path (str): Path to json file that contains the paths of the VCFs and the PED
+        panels (list): panels with a `name` and `variant_ranges`
+        conf_matrix (bool): Initializes API to perform conf_matrix operations
+
+    Returns:
+        (LOCAL_API): the loaded cohort
+    """
+    from local_API import LOCAL_API
+    with open(file_path) as f:
+        config = json.load(f)
+    config['variant_ranges'] = [var_range for panel in panels for var_range in panel['variant_ranges']]
+    return LOCAL_API(file_path, conf_matrix=conf_matrix, config=config)
+
+def train_panel(args):
+    """
+    Trains the tree of one panel on the shared cohort and saves it as `<out_dir>/<name>.json`
+
+    Args:
+        args (tuple): (panel, out_dir)
+
+    Returns:
+        (tuple): name of the panel, path of the model
+    """
+    panel, out_dir = args
+    id3 = ID3(api=PANEL_API(_cohort, panel))
+    id3.train()
+    path = os.path.join(out_dir, '%s.json' % panel['name'])
+    id3.save(path)
+    return panel['name'], path
+
+def train_panels(file_path, out_dir='models', processes=None, panels=None):
+    """
+    Trains one tree per panel over one loaded cohort. The cohort is loaded once with the
+    variants of all of the panels and the panels are trained concurrently by forked worker
+    processes that share the loaded cohort
+
+    Args:
+        file_path (str): Path to json file that contains the paths of the VCFs and the PED
+        out_dir (str): directory the models are saved in
+        processes (int): number of worker processes, the number of CPUs if None
+        panels (list): panels with a `name` and `variant_ranges`, `panels` of the config if None
+
+    Returns:
+        models (dict): name of every panel mapped to the path of its model
+    """
+    global _cohort
+    if panels is None:
+        with open(file_path) as f:
+            panels = json.load(f)['panels']
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    _cohort = load_cohort(file_path, panels)
+    tasks = [(panel, out_dir) for panel in panels]
+    if processes == 1:
+        return dict(train_panel(task) for task in tasks)
+    pool = Pool(processes)
+    try:
+        return dict(pool.map(train_panel, tasks))
+    finally:
+        pool.close()
+        pool.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Trains one tree per variant panel over one loaded cohort')
+    parser.add_argument('config', help='path to the config.json with the `panels` to train')
+    parser.add_argument('-o', '--out-dir', default='models', help='directory the models are saved in')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes')
+    args = parser.parse_args()
+
+    for name, path in sorted(train_panels(args.config, args.out_dir, args.processes).items()):
+        print("%s: %s" % (name, path))
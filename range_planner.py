@@ -0,0 +1,95 @@
+from bisect import bisect_right
+
+def chromosome_key(chrom):
+    """
+    Sort key of a chromosome, numbered chromosomes come first in numeric order
+    followed by the others (X, Y, MT...) in alphabetical order
+
+    Args:
+        chrom (str): chromosome name
+
+    Returns:
+        (tuple): the sort key
+    """
+    chrom = str(chrom)
+    return (0, int(chrom), '') if chrom.isdigit() else (1, 0, chrom)
+
+def plan_ranges(variant_ranges, gap=0):
+    """
+    Normalizes the variant ranges of the config so that every region is fetched once and
+    in file order. The ranges are grouped by chromosome and sorted, overlapping or adjacent
+    ranges are merged into intervals and intervals that are at most `gap` bases apart are
+    fetched together as one window
+
+    Args:
+        variant_ranges (list): ranges in the config format, e.g. {'chr': '22', 'start': 1, 'end': 2}
+        gap (int): maximum number of bases between two intervals fetched as one window
+
+    Returns:
+        windows (list): windows sorted by chromosome and start where every window is a
+                        dictionary with the keys `chr`, `start`, `end` and `intervals`, the
+                        sorted list of (start, end) intervals requested within the window
+    """
+    by_chrom = {}
+    for var_range in variant_ranges:
+        by_chrom.setdefault(str(var_range['chr']), []).append((int(var_range['start']), int(var_range['end'])))
+
+    windows = []
+    for chrom in sorted(by_chrom, key=chromosome_key):
+        # merges overlapping and adjacent ranges
+        intervals = []
+        for start, end in sorted(by_chrom[chrom]):
+            if intervals and start <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+            else:
+                intervals.append((start, end))
+
+        # groups nearby intervals into windows
+        for start, end in intervals:
+            if windows and windows[-1]['chr'] == chrom and start - windows[-1]['end'] <= gap:
+                windows[-1]['end'] = end
+                windows[-1]['intervals'].append((start, end))
+            else:
+                windows.append({'chr': chrom, 'start': start, 'end': end, 'intervals': [(start, end)]})
+    return windows
+
+def in_window(window, start, end):
+    """
+    Checks if a variant fetched with a window overlaps one of the requested intervals of
+    the window rather than only a gap between them
+
+    Args:
+        window (dict): window returned by `plan_ranges`
+        start (int): 0-based start position of the variant
+        end (int): 0-based end position (exclusive) of the variant
+
+    Returns:
+        (bool): whether the variant was requested
+    """
+    intervals = window['intervals']
+    if len(intervals) == 1:
+        return True
+    idx = bisect_right(intervals, (end, end)) - 1
+    while idx >= 0 and intervals[idx][1] > start:
+        if intervals[idx][0] < max(end, start + 1):
+            return True
+        idx -= 1
+    return False
+
+def unique(variant_names):
+    """
+    Removes repeated variant names, keeping the first occurrence of each
+
+    Args:
+        variant_names (list): list of variant names
+
+    Returns:
+        (list): the variant names without repetitions in their original order
+    """
+    seen = set()
+    ret = []
+    for variant_name in variant_names:
+        if variant_name not in seen:
+            seen.add(variant_name)
+            ret.append(variant_name)
+    return ret
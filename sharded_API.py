@@ -0,0 +1,238 @@
+import os
+import json
+import argparse
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import Listener, Client
+from multiprocessing.pool import ThreadPool
+
+class SplitPathNode:
+    """
+    Stand-in for a tree node that only carries a split path, which is all
+    `LOCAL_API.split_subset` reads from the node
+    """
+    def __init__(self, split_path):
+        self.split_path = split_path
+
+def serve_shard(file_path, shard, address, authkey, ready=None):
+    """
+    Loads one shard of the individuals into a LOCAL_API and answers the count requests
+    of a SHARDED_API coordinator until it is told to shut down
+
+    Requests are tuples of (method, args) and are answered with ('ok', result) or
+    ('error', message)
+
+    Args:
+        file_path (str): Path to json file that contains the variant ranges
+        shard (tuple): (index, count) of the shard to load
+        address (tuple): (host, port) to listen on, port 0 picks a free port
+        authkey (bytes): key the coordinator has to authenticate with
+        ready (Connection): pipe the address is sent through once the shard is loaded
+    """
+    from local_API import LOCAL_API
+    api = LOCAL_API(file_path, shard=shard)
+    listener = Listener(address, authkey=authkey)
+    if ready is not None:
+        ready.send(listener.address)
+        ready.close()
+
+    methods = {
+        'variant_name_list': lambda: api.variant_name_list,
+        'ancestry_list': lambda: api.ancestry_list,
+        'get_target_set': api.get_target_set,
+        'split_subset': lambda split_path, split_var: api.split_subset(SplitPathNode(split_path), split_var),
+        'find_next_variant_counts': api.find_next_variant_counts,
+    }
+    try:
+        while True:
+            conn = listener.accept()
+            try:
+                while True:
+                    try:
+                        method, args = conn.recv()
+                    except EOFError:
+                        break
+                    if method == 'shutdown':
+                        conn.send(('ok', None))
+                        return
+                    try:
+                        conn.send(('ok', methods[method](*args)))
+                    except Exception as e:
+                        conn.send(('error', '%s: %s' % (type(e).__name__, e)))
+            finally:
+                conn.close()
+    finally:
+        listener.close()
+
+class SHARDED_API:
+    def __init__(self, file_path):
+        """
+        Initializes the SHARDED_API class, a coordinator with the same interface as LOCAL_API
+        that splits the individuals over worker processes (see `serve_shard`). Every count
+        request is sent to all the workers and their counts are summed, so the individuals
+        never have to fit in the memory of a single machine
+
+        The workers are either running already (`shard_addresses` in the config, started
+        with `python sharded_API.py`) or are started as local processes (`local_shards`).
+        The workers unpickle the requests they receive, so running workers are only
+        connected to with the `shard_authkey` of the config, and local processes are
+        given a random key
+
+        Args:
+            file_path (str): Path to json file that contains the variant ranges
+
+        Attributes:
+            config (json): loaded config file
+            connections (list): connections to the workers
+            processes (list): the worker processes started by this object
+            variant_name_list (list): Names of the variants in the format of
+                                          "CHROMOSOME_#:START_POS:END_POS"
+            ancestry_list (list): A unique list of all the ancestries of people
+        """
+        with open(file_path) as f:
+            self.config = json.load(f)
+        self.processes = []
+        self.connections = []
+
+        if self.config.get('shard_addresses'):
+            if not self.config.get('shard_authkey'):
+                raise ValueError('`shard_authkey` has to be set in the config to connect to `shard_addresses`')
+            authkey = str(self.config['shard_authkey']).encode()
+            addresses = []
+            for address in self.config['shard_addresses']:
+                host, port = address.rsplit(':', 1)
+                addresses.append((host, int(port)))
+        else:
+            authkey = os.urandom(32)
+            count = int(self.config.get('local_shards', 2))
+            ready_conns = []
+            for index in range(count):
+                parent_conn, child_conn = Pipe(duplex=False)
+                process = Process(target=serve_shard, args=(file_path, (index, count), ('127.0.0.1', 0), authkey, child_conn))
+                process.daemon = True
+                process.start()
+                child_conn.close()
+                self.processes.append(process)
+                ready_conns.append(parent_conn)
+            addresses = [ready_conn.recv() for ready_conn in ready_conns]
+
+        self.connections = [Client(address, authkey=authkey) for address in addresses]
+        self.pool = ThreadPool(len(self.connections))
+
+        variant_name_lists = self.call('variant_name_list')
+        if any(names != variant_name_lists[0] for names in variant_name_lists):
+            raise ValueError('The shards were loaded with different variant ranges')
+        self.variant_name_list = variant_name_lists[0]
+        self.ancestry_list = []
+        for ancestry_list in self.call('ancestry_list'):
+            self.ancestry_list.extend(ancestry for ancestry in ancestry_list if ancestry not in self.ancestry_list)
+
+    @staticmethod
+    def request(conn, method, args):
+        conn.send((method, args))
+        status, result = conn.recv()
+        if status != 'ok':
+            raise RuntimeError('Shard failed to answer %s: %s' % (method, result))
+        return result
+
+    def call(self, method, *args):
+        """
+        Sends a request to every worker concurrently
+
+        Returns:
+            (list): the result of every worker
+        """
+        return self.pool.map(lambda conn: SHARDED_API.request(conn, method, args), self.connections)
+
+    @staticmethod
+    def sum_counts(counts_list):
+        """
+        Sums the ancestry counts of the workers
+
+        Args:
+            counts_list (list): dictionaries of ancestry counts
+
+        Returns:
+            counts (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
+        """
+        counts = {}
+        for shard_counts in counts_list:
+            for ancestry, count in shard_counts.items():
+                counts[ancestry] = counts.get(ancestry, 0) + count
+        return counts
+
+    def get_target_set(self):
+        """
+        Gets the target subset, which is the ancestry counts every variant
+
+        Returns:
+            counts (dict): A dictionary containing keys of ancestries and values of the counts for the particular ancestry
+        """
+        return SHARDED_API.sum_counts(self.call('get_target_set'))
+
+    def split_subset(self, node, split_var=None):
+        """
+        Splits the subset given the path of the splits before and a
+        variable to split on.
+
+        Attributes:
+            node (ID3_Node): the node to split, only its split path is sent to the workers
+            split_var (string): The variant name it is now splitting on
+
+        Returns:
+            w_variant_dict (dict): The split subset that includes the variant
+            wo_variant_dict (dict): The split subset that does not include the variant
+        """
+        results = self.call('split_subset', node.split_path, split_var)
+        return SHARDED_API.sum_counts([w for w, wo in results]), SHARDED_API.sum_counts([wo for w, wo in results])
+
+    def find_next_variant_counts(self, split_path, candidates=None):
+        """
+        Finds the counts of the a potential next variant to perform the
+        split on. Only the variants in `candidates` are counted, the counts
+        of the other variants are left empty
+
+        Attributes:
+            split_path (list1, list2):
+                This is the paths of the splits before the current split. The first list
+                is the list of variant names and the second list is the direction
+                of the split. The direction of the second list is depicted by 1's
+                and 0's. Where 1 is splitting in the direction with the variant
+                and 0 is splitting in the direction without the variant.
+            candidates (list): indices of the variants to count, all of the variants if None
+        Returns:
+            w_variant_list:
+                A list representing of a dictionary of ancestry counts per variant
+        """
+        results = self.call('find_next_variant_counts', split_path, candidates)
+        return [SHARDED_API.sum_counts(counts) for counts in zip(*results)]
+
+    def close(self):
+        """
+        Closes the connections and shuts down the worker processes started by this object
+        """
+        for conn in self.connections:
+            if self.processes:
+                SHARDED_API.request(conn, 'shutdown', ())
+            conn.close()
+        self.connections = []
+        self.pool.close()
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serves one shard of the individuals to a SHARDED_API coordinator')
+    parser.add_argument('config', help='path to the config.json')
+    parser.add_argument('shard', help='shard to load as INDEX/COUNT, e.g. 0/4')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on, e.g. 0.0.0.0 for remote coordinators')
+    parser.add_argument('--port', type=int, default=9000)
+    args = parser.parse_args()
+
+    # the worker runs whatever an authenticated client sends it, there is no default key
+    with open(args.config) as f:
+        authkey = json.load(f).get('shard_authkey')
+    if not authkey:
+        parser.error('`shard_authkey` has to be set in the config')
+    authkey = str(authkey).encode()
+    index, count = args.shard.split('/')
+    serve_shard(args.config, (int(index), int(count)), (args.host, args.port), authkey)
@@ -0,0 +1,224 @@
+import os
+import json
+import hashlib
+from multiprocessing.pool import ThreadPool
+from ga4gh_API import GA4GH_API
+from local_API import LOCAL_API, is_carrier
+from range_planner import plan_ranges, in_window, chromosome_key
+
+class SNAPSHOT_API(LOCAL_API):
+    def __init__(self, file_path, conf_matrix=False, shard=None, config=None):
+        """
+        Initializes the SNAPSHOT_API class, a LOCAL_API whose people come from the ga4gh_server
+        instead of VCF files. The calls of the variant ranges of the config and the ethnicity
+        of every patient are pulled from the server once and saved to `snapshot_path`, the
+        tree is then trained locally. The snapshot is pulled again when the variant sets of
+        the dataset (their ids or any of their fields, e.g. their metadata), the ethnicities
+        of the patients or the variant ranges change, or when `snapshot_refresh` is set in the config. A variant set that is
+        re-ingested under the same name with the same metadata keeps its id, so it is only
+        pulled again with `snapshot_refresh`
+
+        Args:
+            file_path (str): Path to json file that contains the variant ranges
+            conf_matrix (bool): Initializes API to perform conf_matrix operations
+            shard (tuple): (index, count) to only load the individuals of one of `count` shards
+            config (dict): config to use instead of the one at `file_path`
+
+        Attributes:
+            server (GA4GH_API): client of the ga4gh_server the snapshot is pulled with, it
+                                counts the requests made to the server
+            dataset_id (str): dataset id of the ga4gh_server that is to b accessed
+            snapshot_path (str): path of the saved snapshot (`snapshot_path` in the config)
+            refresh (bool): pulls a new snapshot even if the saved one is up to date
+                            (`snapshot_refresh` in the config)
+            snapshot (dict): the loaded snapshot, with the keys
+                                fingerprint: hash of the variant sets, the patients and the
+                                             variant ranges
+                                variant_name_list: names of all of the variants found in the
+                                                   variant ranges, carried by anyone or not
+                                samples: individual ID mapped to the indices of its variants
+                                ancestries: individual ID mapped to its ethnicity
+        """
+        if config is None:
+            with open(file_path) as f:
+                config = json.load(f)
+        self.server = GA4GH_API(file_path, config=config, fetch=False)
+        self.dataset_id = self.server.dataset_id
+        self.max_workers = self.server.max_workers
+        self.snapshot_path = config.get('snapshot_path', 'snapshot.json')
+        self.refresh = bool(config.get('snapshot_refresh', False))
+        self.snapshot = None
+        LOCAL_API.__init__(self, file_path, conf_matrix=conf_matrix, shard=shard, config=config)
+
+    def fingerprint(self, variant_sets, patients):
+        """
+        Hashes what the snapshot depends on, the variant sets of the dataset with all of their
+        fields, the ethnicities of the patients and the variant ranges
+
+        Args:
+            variant_sets (list): the variant sets of the dataset
+            patients (list): the patients of the dataset
+
+        Returns:
+            (str): the fingerprint
+        """
+        state = {
+            'dataset_id': self.dataset_id,
+            'variant_sets': sorted(json.dumps(variant_set, sort_keys=True) for variant_set in variant_sets),
+            # a digest of the patients, not all of their fields
+            'patients': hashlib.sha1(json.dumps(sorted(SNAPSHOT_API.read_ethnicities(patients).items())).encode()).hexdigest(),
+            'variant_ranges': plan_ranges(self.config['variant_ranges'], int(self.config.get('range_merge_gap', 0)))
+        }
+        return hashlib.sha1(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def read_ethnicities(patients):
+        """
+        Maps the patients that have an ethnicity to it
+
+        Args:
+            patients (list): the patients of the dataset
+
+        Returns:
+            (dict): individual ID mapped to its ethnicity
+        """
+        return dict((patient['patientId'], patient['ethnicity']) for patient in patients if patient.get('ethnicity'))
+
+    def pull_variant_set(self, variant_set):
+        """
+        Pulls the calls of the variant ranges out of one variant set
+
+        Args:
+            variant_set (dict): variant set of the dataset
+
+        Returns:
+            variant_names (set): names of all of the variants of the variant set in the ranges
+            carriers (dict): individual ID mapped to the set of names of the variants it has
+        """
+        call_sets = self.server.search('callsets/search', {'variantSetId': variant_set['id']}, 'callSets')
+        call_set_names = dict((call_set['id'], call_set.get('patientId') or call_set['name']) for call_set in call_sets)
+        carriers = dict((name, set()) for name in call_set_names.values())
+        variant_names = set()
+        if not call_sets:
+            return variant_names, carriers
+
+        for window in plan_ranges(self.config['variant_ranges'], int(self.config.get('range_merge_gap', 0))):
+            variants = self.server.search('variants/search', {
+                'variantSetId': variant_set['id'],
+                'callSetIds': list(call_set_names),
+                'referenceName': window['chr'],
+                'start': str(window['start']),
+                'end': str(window['end'])
+            }, 'variants')
+            for variant in variants:
+                start, end = int(variant['start']), int(variant['end'])
+                if not in_window(window, start, end):
+                    continue
+                # named like the variants read from the VCFs by LOCAL_API
+                variant_name = ':'.join([window['chr'], str(start), str(start + 1)])
+                variant_names.add(variant_name)
+                for call in variant.get('calls', []):
+                    # skips calls of call sets that were not requested
+                    indiv_id = call_set_names.get(call.get('callSetId'))
+                    if indiv_id is not None and is_carrier(call.get('genotype')):
+                        carriers[indiv_id].add(variant_name)
+        return variant_names, carriers
+
+    def pull_snapshot(self, variant_sets, patients, fingerprint):
+        """
+        Pulls the calls of every variant set from the server
+
+        Args:
+            variant_sets (list): the variant sets of the dataset
+            patients (list): the patients of the dataset
+            fingerprint (str): fingerprint of the variant sets, the patients and the variant ranges
+
+        Returns:
+            snapshot (dict): the snapshot, see `snapshot` in `__init__`
+        """
+        pool = ThreadPool(max(1, min(self.max_workers, len(variant_sets))))
+        try:
+            results = pool.map(self.pull_variant_set, variant_sets)
+        finally:
+            pool.close()
+
+        all_variant_names = set()
+        carriers = {}
+        for variant_names, variant_set_carriers in results:
+            all_variant_names.update(variant_names)
+            for indiv_id, carried in variant_set_carriers.items():
+                carriers.setdefault(indiv_id, set()).update(carried)
+
+        def position(variant_name):
+            chrom, start, end = variant_name.split(':')
+            return chromosome_key(chrom), int(start)
+        variant_name_list = sorted(all_variant_names, key=position)
+        variant_index = dict((variant_name, idx) for idx, variant_name in enumerate(variant_name_list))
+        return {
+            'fingerprint': fingerprint,
+            'variant_name_list': variant_name_list,
+            'samples': dict((indiv_id, sorted(variant_index[name] for name in names)) for indiv_id, names in carriers.items()),
+            'ancestries': SNAPSHOT_API.read_ethnicities(patients)
+        }
+
+    def load_snapshot(self):
+        """
+        Loads the saved snapshot, pulling and saving a new one if there is none, if the
+        variant sets or the patients of the dataset or the variant ranges changed since it
+        was pulled or if `refresh` is set
+
+        Returns:
+            snapshot (dict): the snapshot, see `snapshot` in `__init__`
+        """
+        variant_sets = self.server.search('variantsets/search', {'datasetId': self.dataset_id}, 'variantSets')
+        patients = self.server.search('patients/search', {'datasetId': self.dataset_id}, 'patients')
+        fingerprint = self.fingerprint(variant_sets, patients)
+        if not self.refresh and os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            if snapshot.get('fingerprint') == fingerprint:
+                return snapshot
+
+        snapshot = self.pull_snapshot(variant_sets, patients, fingerprint)
+        tmp_path = '%s.tmp' % self.snapshot_path
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.rename(tmp_path, self.snapshot_path)
+        return snapshot
+
+    def load_variant_dict(self):
+        """
+        Loads the variants of the people from the snapshot, see `LOCAL_API.create_variant_dict`
+
+        Returns:
+            variant_dict (dict): A dictionary where the
+                                    key: is the individual ID
+                                    value: is the list of variants of the person
+        """
+        self.snapshot = self.load_snapshot()
+        self.variant_name_list = list(self.snapshot['variant_name_list'])
+        self.variant_spans = [tuple(int(pos) for pos in variant_name.split(':')[1:]) for variant_name in self.variant_name_list]
+        variant_dict = {}
+        for column, indiv_id in enumerate(sorted(self.snapshot['samples'])):
+            # skips people of other shards
+            if self.shard and column % self.shard[1] != self.shard[0]:
+                continue
+            variant_idxs = self.snapshot['samples'][indiv_id]
+            if self.storage == 'sparse':
+                variant_dict[indiv_id] = list(variant_idxs)
+            else:
+                variants = [0] * len(self.variant_name_list)
+                for idx in variant_idxs:
+                    variants[idx] = 1
+                variant_dict[indiv_id] = variants
+        return variant_dict
+
+    def read_ancestries(self):
+        """
+        Reads the ethnicity of the patients from the snapshot
+
+        Returns:
+            (generator): (individual ID, population) of every patient
+        """
+        for indiv_id in sorted(self.snapshot['ancestries']):
+            yield indiv_id, self.snapshot['ancestries'][indiv_id]
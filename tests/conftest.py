@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import random
+import pytest
+
+# the modules of the classifier are at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_cohort import POPULATIONS, PEOPLE_PER_POPULATION, VARIANTS, VARIANT_RANGES, write_vcf
+
+@pytest.fixture(scope='session')
+def cohort(tmpdir_factory):
+    """
+    A small synthetic cohort of three populations, written as a phased multi-sample
+    VCF, a `.ped` file and a config for the `local` backend
+
+    Returns:
+        (dict): with the keys `dir`, `config_path`, `config`, `vcf_path`, `samples`,
+                `genotypes` and `ancestries`
+    """
+    tmpdir = tmpdir_factory.mktemp('cohort')
+    rand = random.Random(7)
+    samples = []
+    ancestries = {}
+    genotypes = {}
+    for population in POPULATIONS:
+        for i in range(PEOPLE_PER_POPULATION):
+            sample = '%s%03d' % (population, i)
+            samples.append(sample)
+            ancestries[sample] = population
+            genotypes[sample] = [tuple(int(rand.random() < frequencies[population] / 2.0) for allele in range(2))
+                                 for start, frequencies in VARIANTS]
+
+    vcf_path = write_vcf(str(tmpdir.join('cohort.vcf')), samples, genotypes)
+    ped_path = str(tmpdir.join('cohort.ped'))
+    with open(ped_path, 'w') as f:
+        f.write('Family ID\tIndividual ID\tPaternal ID\tMaternal ID\tGender\tPhenotype\tPopulation\tRelationship\n')
+        for sample in samples:
+            f.write('%s\t%s\t0\t0\t1\t0\t%s\tunrel\n' % (sample, sample, ancestries[sample]))
+
+    config = {
+        'variant_ranges': VARIANT_RANGES,
+        'ga4gh_server_url': 'http://localhost:8000/',
+        'ga4gh_server_dataset_id': 'WyIxa2dlbm9tZSJd',
+        'user_mapping_path': ped_path,
+        'chr_paths': {'22': vcf_path}
+    }
+    config_path = str(tmpdir.join('config.json'))
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+
+    return {
+        'dir': tmpdir,
+        'config_path': config_path,
+        'config': config,
+        'vcf_path': vcf_path,
+        'samples': samples,
+        'genotypes': genotypes,
+        'ancestries': ancestries,
+    }
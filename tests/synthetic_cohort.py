@@ -0,0 +1,80 @@
+"""
+Helpers that write a small synthetic cohort for the tests
+"""
+import json
+
+POPULATIONS = ['GBR', 'YRI', 'CHB']
+PEOPLE_PER_POPULATION = 20
+# start of every variant of the cohort on chromosome 22 and its frequency in every population
+VARIANTS = [
+    (1000, {'GBR': 0.8, 'YRI': 0.1, 'CHB': 0.1}),
+    (1010, {'GBR': 0.1, 'YRI': 0.7, 'CHB': 0.2}),
+    (1020, {'GBR': 0.2, 'YRI': 0.2, 'CHB': 0.9}),
+    (1030, {'GBR': 0.5, 'YRI': 0.5, 'CHB': 0.5}),
+    (1040, {'GBR': 0.0, 'YRI': 0.0, 'CHB': 0.0}),
+    (2000, {'GBR': 0.3, 'YRI': 0.9, 'CHB': 0.1}),
+    (2010, {'GBR': 0.6, 'YRI': 0.1, 'CHB': 0.6}),
+    (2020, {'GBR': 0.05, 'YRI': 0.05, 'CHB': 0.4}),
+]
+VARIANT_RANGES = [
+    {'chr': '22', 'start': 990, 'end': 1050},
+    {'chr': '22', 'start': 1995, 'end': 2030},
+]
+
+def write_vcf(path, samples, genotypes, phased=True, chrom='22', refs=None):
+    """
+    Writes and indexes a VCF of chromosome 22 with one record per variant of `VARIANTS`
+
+    Args:
+        path (str): path of the VCF, without the `.gz` of the written file
+        samples (list): ids of the samples
+        genotypes (dict): sample id mapped to a list of (allele, allele) per variant,
+                          None for a no-call
+        phased (bool): writes the genotypes as `0|1` if True, as `0/1` otherwise
+        chrom (str): name of the chromosome in the file
+        refs (dict): start of a variant mapped to its reference allele, `A` if not given
+
+    Returns:
+        (str): path of the bgzipped and indexed VCF
+    """
+    import pysam
+    sep = '|' if phased else '/'
+    with open(path, 'w') as f:
+        f.write('##fileformat=VCFv4.1\n')
+        f.write('##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n')
+        f.write('\t'.join(['#CHROM', 'POS', 'ID', 'REF', 'ALT', 'QUAL', 'FILTER', 'INFO', 'FORMAT'] + samples) + '\n')
+        for idx, (start, frequencies) in enumerate(VARIANTS):
+            calls = []
+            for sample in samples:
+                genotype = genotypes[sample][idx]
+                calls.append('.%s.' % sep if genotype is None else sep.join(str(allele) for allele in genotype))
+            f.write('\t'.join([chrom, str(start + 1), '.', (refs or {}).get(start, 'A'), 'G', '100', 'PASS', '.', 'GT'] + calls) + '\n')
+    return pysam.tabix_index(path, preset='vcf', force=True)
+
+def write_config(tmpdir, config, **options):
+    """
+    Writes `config` updated with `options` as `config.json` in `tmpdir`
+
+    Returns:
+        (str): path of the config
+    """
+    config_path = str(tmpdir.join('config.json'))
+    with open(config_path, 'w') as f:
+        json.dump(dict(config, **options), f)
+    return config_path
+
+def carried_variants(genotypes):
+    """
+    Returns:
+        (list): names of the variants of `VARIANTS` a person with these genotypes has
+    """
+    return ['22:%s:%s' % (start, start + 1) for (start, frequencies), genotype in zip(VARIANTS, genotypes)
+            if genotype is not None and any(genotype)]
+
+def tree_structure(node):
+    """
+    Returns:
+        (tuple): the variant, direction, counts and children of every node below `node`
+    """
+    return (node.variant_name, node.with_variant, sorted((k, v) for k, v in node.subset.items() if v),
+            [tree_structure(child) for child in node.children])
@@ -0,0 +1,52 @@
+import os
+import sys
+import subprocess
+import pytest
+from ID3_Class import ID3
+from BatchPredictor import BatchPredictor
+from synthetic_cohort import write_vcf, carried_variants
+
+@pytest.fixture(scope='module')
+def id3(cohort):
+    id3 = ID3(cohort['config_path'])
+    id3.train()
+    return id3
+
+@pytest.mark.parametrize('phased', [True, False])
+def test_predict_vcfs_matches_predict(cohort, id3, tmpdir, phased):
+    samples = cohort['samples']
+    genotypes = dict((sample, list(cohort['genotypes'][sample])) for sample in samples)
+    # no-calls are not carriers of the variant
+    for sample in samples[::7]:
+        genotypes[sample][0] = None
+    vcf_path = write_vcf(str(tmpdir.join('batch.vcf')), samples, genotypes, phased=phased)
+
+    predictor = BatchPredictor(id3, chunk_size=7, processes=2)
+    predictions = dict(predictor.predict_vcfs([vcf_path]))
+
+    assert sorted(predictions) == sorted(samples)
+    for sample in samples:
+        assert predictions[sample] is id3.predict(carried_variants(genotypes[sample]))
+
+def test_file_without_the_tested_chromosomes_is_rejected(cohort, id3, tmpdir):
+    vcf_path = write_vcf(str(tmpdir.join('chr.vcf')), cohort['samples'], cohort['genotypes'], chrom='chr22')
+    predictor = BatchPredictor(id3, processes=1)
+    with pytest.raises(ValueError):
+        list(predictor.predict_vcfs([vcf_path]))
+
+def test_cli_predicts_with_a_saved_model(cohort, id3, tmpdir):
+    model_path = str(tmpdir.join('model.json'))
+    id3.save(model_path)
+    out_path = str(tmpdir.join('predictions.tsv'))
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'BatchPredictor.py')
+    # the config is never read, a missing one shows the tree is not trained again
+    subprocess.check_call([sys.executable, script, '--model', model_path, '-c', str(tmpdir.join('missing.json')),
+                           '-o', out_path, '--processes', '1', cohort['vcf_path']])
+
+    with open(out_path) as f:
+        rows = [line.rstrip('\n').split('\t') for line in f][1:]
+    assert len(rows) == len(cohort['samples'])
+    for sample, ancestry, total_count, counts in rows:
+        node = id3.predict(carried_variants(cohort['genotypes'][sample]))
+        assert ancestry == node.most_common_ancestry
+        assert int(total_count) == node.total_count
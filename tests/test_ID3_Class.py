@@ -0,0 +1,143 @@
+import pytest
+from ID3_Class import ID3
+from local_API import LOCAL_API
+from synthetic_cohort import tree_structure
+
+class COUNTING_API:
+    """
+    LOCAL_API that counts requests like GA4GH_API, a request per candidate counted by
+    `find_next_variant_counts` and one per side of `split_subset`
+    """
+    def __init__(self, api):
+        self.api = api
+        self.config = {}
+        self.variant_name_list = api.variant_name_list
+        self.ancestry_list = api.ancestry_list
+        self.request_count = 0
+
+    def get_target_set(self):
+        return self.api.get_target_set()
+
+    def split_subset(self, node, split_var=None):
+        self.request_count += 2
+        return self.api.split_subset(node, split_var)
+
+    def find_next_variant_counts(self, split_path, candidates=None):
+        self.request_count += len(self.variant_name_list) if candidates is None else len(candidates)
+        return self.api.find_next_variant_counts(split_path, candidates)
+
+@pytest.fixture(scope='module')
+def local_api(cohort):
+    return LOCAL_API(cohort['config_path'])
+
+def train(api, **limits):
+    id3 = ID3(api=api, limits=limits)
+    id3.train()
+    return id3
+
+def test_max_requests_is_checked_before_every_split_search(local_api):
+    unlimited = train(COUNTING_API(local_api))
+    # the most a build can go over the budget, the requests of one search and one split
+    step = len(local_api.variant_name_list) + 2
+
+    assert train(COUNTING_API(local_api), max_requests=0).api.request_count == 0
+    for max_requests in range(1, unlimited.api.request_count, 5):
+        limited = train(COUNTING_API(local_api), max_requests=max_requests)
+        assert limited.api.request_count <= max_requests + step
+
+    limited = train(COUNTING_API(local_api), max_requests=unlimited.api.request_count)
+    assert tree_structure(limited.root_node) == tree_structure(unlimited.root_node)
+
+def nodes(root_node):
+    stack = [root_node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+def split_gain(node):
+    """
+    Returns:
+        (float): information gain of the split of a node into its children
+    """
+    return ID3.entropy_by_count(node.subset) - sum(child.total_count / float(node.total_count) * ID3.entropy_by_count(child.subset)
+                                                   for child in node.children)
+
+@pytest.fixture(scope='module')
+def unlimited(local_api):
+    return train(local_api)
+
+def test_max_depth(local_api, unlimited):
+    depth = max(node.depth for node in nodes(unlimited.root_node))
+    assert depth >= 3
+    assert not train(local_api, max_depth=0).root_node.children
+    for max_depth in range(1, depth):
+        tree = train(local_api, max_depth=max_depth).root_node
+        assert max(node.depth for node in nodes(tree)) == max_depth
+    assert tree_structure(train(local_api, max_depth=depth).root_node) == tree_structure(unlimited.root_node)
+
+def test_min_samples_split(local_api, unlimited):
+    for min_samples_split in (5, 10, 30):
+        tree = train(local_api, min_samples_split=min_samples_split).root_node
+        assert all(node.total_count >= min_samples_split for node in nodes(tree) if node.children)
+        assert sum(1 for node in nodes(tree)) < sum(1 for node in nodes(unlimited.root_node))
+    assert not train(local_api, min_samples_split=61).root_node.children
+
+def test_min_samples_leaf(local_api, unlimited):
+    assert min(node.total_count for node in nodes(unlimited.root_node)) < 5
+    for min_samples_leaf in (5, 10):
+        tree = train(local_api, min_samples_leaf=min_samples_leaf).root_node
+        assert tree.children
+        assert all(node.total_count >= min_samples_leaf for node in nodes(tree))
+
+def test_min_gain(local_api, unlimited):
+    gains = sorted(split_gain(node) for node in nodes(unlimited.root_node) if node.children)
+    min_gain = gains[len(gains) // 2]
+    tree = train(local_api, min_gain=min_gain).root_node
+    assert tree.children
+    assert all(split_gain(node) > min_gain for node in nodes(tree) if node.children)
+    assert not train(local_api, min_gain=gains[-1]).root_node.children
+
+def test_max_nodes(local_api, unlimited):
+    node_count = sum(1 for node in nodes(unlimited.root_node))
+    for max_nodes in range(1, node_count, 2):
+        assert sum(1 for node in nodes(train(local_api, max_nodes=max_nodes).root_node)) == max_nodes
+    # a budget between two splits leaves the last one out
+    assert sum(1 for node in nodes(train(local_api, max_nodes=4).root_node)) == 3
+    assert tree_structure(train(local_api, max_nodes=node_count).root_node) == tree_structure(unlimited.root_node)
+
+def expanded_leaf(before, after):
+    """
+    Returns:
+        (ID3_Node): the leaf of `before` that has children in `after`, the trees being the same otherwise
+    """
+    pairs = [(before, after)]
+    expanded = []
+    while pairs:
+        node, other = pairs.pop()
+        assert (node.variant_name, node.with_variant, node.subset) == (other.variant_name, other.with_variant, other.subset)
+        if node.children:
+            assert len(node.children) == len(other.children)
+            pairs.extend(zip(node.children, other.children))
+        elif other.children:
+            expanded.append(node)
+    assert len(expanded) == 1
+    return expanded[0]
+
+def test_max_nodes_splits_the_best_open_node_first(local_api, unlimited):
+    splits = sum(1 for node in nodes(unlimited.root_node) if node.children)
+    before = train(local_api, max_nodes=1)
+    for split in range(1, min(splits, 8) + 1):
+        after = train(local_api, max_nodes=2 * split + 1)
+        expanded = expanded_leaf(before.root_node, after.root_node)
+
+        # the expanded node has the highest gain of the nodes left open by the smaller budget
+        gains = {}
+        for leaf in nodes(before.root_node):
+            if leaf.children:
+                continue
+            split_index, info_gain, live_candidates = before.find_variant_split(leaf.subset, leaf.split_path)
+            if not before.is_leaf_node(leaf.subset, leaf.split_path, split_index):
+                gains[leaf] = info_gain
+        assert gains[expanded] == max(gains.values())
+        before = after
@@ -0,0 +1,124 @@
+import json
+import threading
+import pytest
+import requests
+import ga4gh_API
+from ga4gh_API import GA4GH_API
+from synthetic_cohort import VARIANTS
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+class VariantServer:
+    """
+    Stand-in for the `variants/search` and `count` endpoints of the ga4gh_server with the
+    variants of the synthetic cohort. Pages are answered `pageSize` variants at a time and
+    the keys of every variant are written in `key_order`
+
+    Attributes:
+        key_order (list): order of the keys of every variant in the response
+        counts (dict): ethnicity counts answered by `count`
+        requests (list): (endpoint, page token) of every request
+    """
+    def __init__(self, key_order):
+        self.key_order = key_order
+        self.counts = {'GBR': 3, 'YRI': 2}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode())
+                data = stub.answer(self.path.strip('/'), body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%s/' % self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def answer(self, endpoint, body):
+        self.requests.append((endpoint, body.get('pageToken')))
+        if endpoint == 'count':
+            # the padding after the counts is left unread by ijson
+            return '{"results": {"patients": [{"ethnicity": %s}]}, "padding": "%s"}' % (json.dumps(self.counts), ' ' * 2 ** 20)
+
+        variants = [{'referenceName': '22', 'start': str(start), 'end': str(start + 1), 'calls': []}
+                    for start, frequencies in VARIANTS
+                    if body['referenceName'] == '22' and int(body['start']) <= start < int(body['end'])]
+        page_start = int(body.get('pageToken') or 0)
+        page_end = page_start + int(body['pageSize'])
+        # written by hand so the keys of the variants come in `key_order`
+        items = ['{%s}' % ', '.join('%s: %s' % (json.dumps(key), json.dumps(variant[key])) for key in self.key_order)
+                 for variant in variants[page_start:page_end]]
+        page = '"variants": [%s]' % ', '.join(items)
+        if page_end < len(variants):
+            page += ', "nextPageToken": "%s"' % page_end
+        return '{"results": {%s}}' % page
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture(params=['ijson', 'json'])
+def parser(request, monkeypatch):
+    if request.param == 'ijson':
+        if ga4gh_API.ijson is None:
+            pytest.skip('ijson is not installed')
+    else:
+        monkeypatch.setattr(ga4gh_API, 'ijson', None)
+    return request.param
+
+@pytest.fixture(params=[['start', 'end', 'referenceName', 'calls'], ['calls', 'end', 'referenceName', 'start']])
+def server(request):
+    server = VariantServer(request.param)
+    yield server
+    server.close()
+
+@pytest.fixture
+def responses(monkeypatch):
+    """
+    Records every response of the server
+    """
+    responses = []
+    post = requests.post
+
+    def recording_post(*args, **kwargs):
+        r = post(*args, **kwargs)
+        responses.append(r)
+        return r
+    monkeypatch.setattr(requests, 'post', recording_post)
+    return responses
+
+def write_config(tmpdir, cohort, server):
+    config = dict(cohort['config'], ga4gh_server_url=server.url, ga4gh_page_size=2)
+    config_path = str(tmpdir.join('config.json'))
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    return config_path
+
+def test_query_variants_reads_every_page(cohort, tmpdir, server, parser, responses):
+    api = GA4GH_API(write_config(tmpdir, cohort, server))
+
+    assert api.variant_name_list == ['22:%s:%s' % (start, start + 1) for start, frequencies in VARIANTS]
+    # pages of 2 variants, 3 for the 5 variants of the first window and 2 for the 3 of the second
+    assert sorted(str(page_token) for endpoint, page_token in server.requests) == ['2', '2', '4', 'None', 'None']
+    assert api.request_count == len(server.requests)
+    assert all(r.raw.closed for r in responses)
+
+def test_count_closes_the_response(cohort, tmpdir, server, parser, responses):
+    api = GA4GH_API(write_config(tmpdir, cohort, server))
+    del responses[:]
+
+    assert api.count(api.craft_api_request()) == server.counts
+    assert len(responses) == 1 and responses[0].raw.closed
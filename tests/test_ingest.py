@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+from synthetic_cohort import VARIANTS, write_vcf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ga4gh_server'))
+from ingest import Ingest
+
+# stand-in for `ga4gh_repo` that keeps the variant sets of the registry in a JSON file,
+# adding a variant set that exists or removing one that doesn't fails like ga4gh_repo does
+REPO_CMD = '''
+import os, sys, json
+args = sys.argv[1:]
+for flag in ('-I', '-R'):
+    if flag in args:
+        del args[args.index(flag):args.index(flag) + 2]
+args = [arg for arg in args if arg != '-f']
+command, registry, dataset = args[:3]
+variant_sets = json.load(open(registry)) if os.path.exists(registry) else []
+if command == 'add-variantset':
+    name = args[4]
+    if name in variant_sets or name.split('_')[0] == os.environ.get('FAIL_ADD'):
+        sys.exit('cannot add %s' % name)
+    variant_sets.append(name)
+elif command == 'remove-variantset':
+    name = args[3]
+    if name not in variant_sets:
+        sys.exit('missing %s' % name)
+    variant_sets.remove(name)
+json.dump(variant_sets, open(registry, 'w'))
+'''
+
+def write_sample(samples_dir, sample, allele):
+    genotypes = {sample: [(allele, 0)] * len(VARIANTS)}
+    return write_vcf(str(samples_dir.join('%s.vcf' % sample)), [sample], genotypes)
+
+def make_ingest(tmpdir, registry='registry.db'):
+    repo_script = tmpdir.join('ga4gh_repo.py')
+    repo_script.write(REPO_CMD)
+    return Ingest(str(tmpdir.join(registry)), '1kgenome', str(tmpdir.join('samples')),
+                  repo_cmd='%s %s' % (sys.executable, repo_script), workers=2)
+
+def registry_sets(ingest):
+    with open(ingest.registry) as f:
+        return sorted(json.load(f))
+
+def test_rerun_resumes_a_failed_replace(tmpdir, monkeypatch):
+    samples_dir = tmpdir.mkdir('samples')
+    write_sample(samples_dir, 'HG1', 0)
+    write_sample(samples_dir, 'HG2', 0)
+    assert make_ingest(tmpdir).run() == []
+    assert registry_sets(make_ingest(tmpdir)) == ['HG1_chr22', 'HG2_chr22']
+    assert make_ingest(tmpdir).discover() == []
+
+    # the changed file is removed from the registry but adding it again fails
+    vcf_path = write_sample(samples_dir, 'HG1', 1)
+    os.utime(vcf_path, (os.path.getatime(vcf_path), os.path.getmtime(vcf_path) + 10))
+    monkeypatch.setenv('FAIL_ADD', 'HG1')
+    assert len(make_ingest(tmpdir).run()) == 1
+    assert registry_sets(make_ingest(tmpdir)) == ['HG2_chr22']
+
+    monkeypatch.delenv('FAIL_ADD')
+    ingest = make_ingest(tmpdir)
+    assert ingest.run() == []
+    assert registry_sets(ingest) == ['HG1_chr22', 'HG2_chr22']
+    assert ingest.manifest[os.path.abspath(vcf_path)]['variant_set'] == 'HG1_chr22'
+
+def test_seed_manifest_of_a_filled_registry(tmpdir):
+    samples_dir = tmpdir.mkdir('samples')
+    write_sample(samples_dir, 'HG1', 0)
+    write_sample(samples_dir, 'HG2', 0)
+    tmpdir.join('registry.db').write(json.dumps(['HG1_chr22', 'HG2_chr22']))
+
+    assert make_ingest(tmpdir).seed() == 2
+    ingest = make_ingest(tmpdir)
+    assert ingest.discover() == []
+    assert ingest.run() == []
+    assert registry_sets(ingest) == ['HG1_chr22', 'HG2_chr22']
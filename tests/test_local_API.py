@@ -0,0 +1,64 @@
+import pytest
+from ID3_Class import ID3
+from ConfusionMatrix import ConfusionMatrix
+from local_API import LOCAL_API, is_carrier
+from synthetic_cohort import write_vcf, write_config, tree_structure
+
+def test_is_carrier():
+    # PyVCF `gt_alleles`
+    assert is_carrier(['0', '1'])
+    assert is_carrier(['2', '2'])
+    assert not is_carrier(['0', '0'])
+    assert not is_carrier([None, None])
+    assert not is_carrier(['1', None])
+    assert not is_carrier(None)
+    # GA4GH `genotype`
+    assert is_carrier([1, 0])
+    assert not is_carrier([0, 0])
+    assert not is_carrier([-1, -1])
+    assert not is_carrier([-1, 1])
+    assert not is_carrier([])
+
+def test_unphased_cohort_with_no_calls(cohort, tmpdir):
+    samples = cohort['samples']
+    with_no_calls = dict((sample, list(cohort['genotypes'][sample])) for sample in samples)
+    for sample in samples[::5]:
+        with_no_calls[sample][0] = None
+    # the same cohort with the no-calls read as homozygous reference
+    as_reference = dict((sample, [(0, 0) if genotype is None else genotype for genotype in genotypes])
+                        for sample, genotypes in with_no_calls.items())
+
+    unphased_dir = tmpdir.mkdir('unphased')
+    unphased_vcf = write_vcf(str(unphased_dir.join('cohort.vcf')), samples, with_no_calls, phased=False)
+    unphased = LOCAL_API(write_config(unphased_dir, cohort['config'], chr_paths={'22': unphased_vcf}))
+    phased_dir = tmpdir.mkdir('phased')
+    phased_vcf = write_vcf(str(phased_dir.join('cohort.vcf')), samples, as_reference)
+    phased = LOCAL_API(write_config(phased_dir, cohort['config'], chr_paths={'22': phased_vcf}))
+
+    assert unphased.indiv_list == phased.indiv_list
+    assert unphased.variant_list == phased.variant_list
+    assert 0 < sum(sum(variants) for variants in unphased.variant_list) < len(samples) * len(unphased.variant_name_list)
+
+    unphased_id3 = ID3(api=unphased)
+    unphased_id3.train()
+    phased_id3 = ID3(api=phased)
+    phased_id3.train()
+    assert tree_structure(unphased_id3.root_node) == tree_structure(phased_id3.root_node)
+
+@pytest.mark.parametrize('sparse_density', [0, 0.3, 1])
+def test_sparse_storage_matches_dense(cohort, tmpdir, sparse_density):
+    sparse_config = write_config(tmpdir, cohort['config'], storage='sparse', sparse_density=sparse_density)
+    sparse = LOCAL_API(sparse_config)
+    dense = LOCAL_API(cohort['config_path'])
+    if sparse_density == 0.3:
+        # both kinds of columns are used
+        assert len(set(column.dtype == bool for column in sparse.columns)) == 2
+    assert sparse.count_variants() == dense.count_variants()
+
+    sparse_id3 = ID3(api=sparse)
+    sparse_id3.train()
+    dense_id3 = ID3(api=dense)
+    dense_id3.train()
+    assert tree_structure(sparse_id3.root_node) == tree_structure(dense_id3.root_node)
+
+    assert ConfusionMatrix(sparse_config).conf_matrix == ConfusionMatrix(cohort['config_path']).conf_matrix
@@ -0,0 +1,69 @@
+import json
+import pytest
+from ID3_Class import ID3
+from multi_panel import PANEL_API, load_cohort, train_panels
+from synthetic_cohort import write_vcf, write_config, carried_variants, tree_structure
+
+PANELS = [
+    {'name': 'first', 'variant_ranges': [{'chr': '22', 'start': 990, 'end': 1050}]},
+    # the deletion at 1000 overlaps the range without starting in it
+    {'name': 'overlap', 'variant_ranges': [{'chr': '22', 'start': 1005, 'end': 1015},
+                                           {'chr': '22', 'start': 1995, 'end': 2030}]},
+    # fetched as one window, 1010 and 1020 are only in its gap
+    {'name': 'gapped', 'variant_ranges': [{'chr': '22', 'start': 995, 'end': 1001},
+                                          {'chr': '22', 'start': 1025, 'end': 1035},
+                                          {'chr': '22', 'start': 2015, 'end': 2025}]},
+]
+
+@pytest.fixture(scope='module')
+def config_path(cohort, tmpdir_factory):
+    tmpdir = tmpdir_factory.mktemp('panels')
+    # the variant at 1000 is a deletion of 12 bases
+    vcf_path = write_vcf(str(tmpdir.join('cohort.vcf')), cohort['samples'], cohort['genotypes'], refs={1000: 'ACGTACGTACGT'})
+    return write_config(tmpdir, cohort['config'], chr_paths={'22': vcf_path}, range_merge_gap=100, panels=PANELS)
+
+@pytest.fixture(scope='module')
+def standalone(config_path, tmpdir_factory):
+    """
+    The tree of every panel trained on its own, as if the panel was the config
+    """
+    with open(config_path) as f:
+        config = json.load(f)
+    trees = {}
+    for panel in PANELS:
+        tmpdir = tmpdir_factory.mktemp(panel['name'])
+        id3 = ID3(write_config(tmpdir, config, variant_ranges=panel['variant_ranges']))
+        id3.train()
+        trees[panel['name']] = id3
+    return trees
+
+def test_panel_variants_match_standalone(config_path, standalone):
+    cohort = load_cohort(config_path, PANELS)
+    assert [PANEL_API(cohort, panel).variant_name_list for panel in PANELS] == \
+        [standalone[panel['name']].api.variant_name_list for panel in PANELS]
+    assert standalone['overlap'].api.variant_name_list[0] == '22:1000:1001'
+    assert standalone['gapped'].api.variant_name_list == ['22:1000:1001', '22:1030:1031', '22:2020:2021']
+
+def test_candidates_are_translated(config_path, standalone):
+    cohort = load_cohort(config_path, PANELS)
+    panel = PANEL_API(cohort, PANELS[2])
+    standalone_api = standalone['gapped'].api
+    split_path = (['22:1030:1031'], [1])
+    assert panel.find_next_variant_counts(split_path) == standalone_api.find_next_variant_counts(split_path)
+    for candidates in ([0], [2], [0, 2]):
+        counts = panel.find_next_variant_counts(split_path, candidates)
+        assert counts == standalone_api.find_next_variant_counts(split_path, candidates)
+        assert [idx for idx, count in enumerate(counts) if count] == candidates
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_saved_panel_trees_match_standalone(cohort, config_path, standalone, tmpdir, processes):
+    models = train_panels(config_path, str(tmpdir.join('models')), processes=processes)
+    assert sorted(models) == sorted(panel['name'] for panel in PANELS)
+
+    for name, path in models.items():
+        # the config is never read, a missing one shows no variants are read to predict
+        loaded = ID3.load(path, str(tmpdir.join('missing.json')))
+        assert tree_structure(loaded.root_node) == tree_structure(standalone[name].root_node)
+        for sample in cohort['samples']:
+            variants = carried_variants(cohort['genotypes'][sample])
+            assert tree_structure(loaded.predict(variants)) == tree_structure(standalone[name].predict(variants))
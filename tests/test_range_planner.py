@@ -0,0 +1,74 @@
+from local_API import LOCAL_API
+from range_planner import plan_ranges, in_window, unique, chromosome_key
+from synthetic_cohort import write_config
+
+def test_overlapping_and_adjacent_ranges_are_merged():
+    windows = plan_ranges([
+        {'chr': '22', 'start': 150, 'end': 300},
+        {'chr': '22', 'start': 100, 'end': 200},
+        # adjacent to the merged range
+        {'chr': '22', 'start': 300, 'end': 350},
+        # contained in the merged range
+        {'chr': '22', 'start': 120, 'end': 130},
+        {'chr': '22', 'start': 351, 'end': 400},
+    ])
+    assert windows == [
+        {'chr': '22', 'start': 100, 'end': 350, 'intervals': [(100, 350)]},
+        {'chr': '22', 'start': 351, 'end': 400, 'intervals': [(351, 400)]},
+    ]
+
+def test_nearby_ranges_are_fetched_as_one_window():
+    variant_ranges = [
+        {'chr': 'X', 'start': 10, 'end': 20},
+        {'chr': 22, 'start': 500, 'end': 600},
+        {'chr': '22', 'start': 100, 'end': 200},
+        {'chr': '22', 'start': 250, 'end': 300},
+        {'chr': '2', 'start': 10, 'end': 20},
+    ]
+    assert plan_ranges(variant_ranges, gap=50) == [
+        {'chr': '2', 'start': 10, 'end': 20, 'intervals': [(10, 20)]},
+        {'chr': '22', 'start': 100, 'end': 300, 'intervals': [(100, 200), (250, 300)]},
+        {'chr': '22', 'start': 500, 'end': 600, 'intervals': [(500, 600)]},
+        {'chr': 'X', 'start': 10, 'end': 20, 'intervals': [(10, 20)]},
+    ]
+    assert [window['end'] for window in plan_ranges(variant_ranges, gap=300)] == [20, 600, 20]
+    assert len(plan_ranges(variant_ranges, gap=49)) == 5
+
+def test_variants_in_a_gap_are_not_in_the_window():
+    window = plan_ranges([{'chr': '22', 'start': 100, 'end': 200},
+                          {'chr': '22', 'start': 250, 'end': 300},
+                          {'chr': '22', 'start': 400, 'end': 500}], gap=200)[0]
+    assert in_window(window, 100, 101)
+    assert in_window(window, 199, 200)
+    assert in_window(window, 250, 251)
+    assert in_window(window, 499, 500)
+    # only in a gap
+    assert not in_window(window, 200, 201)
+    assert not in_window(window, 220, 250)
+    assert not in_window(window, 300, 400)
+    # insertions (start == end) are a base long
+    assert in_window(window, 150, 150)
+    assert not in_window(window, 200, 200)
+    # spanning a gap into an interval
+    assert in_window(window, 190, 260)
+    assert in_window(window, 350, 450)
+    # a window of one interval holds whatever the server returns for it
+    assert in_window(plan_ranges([{'chr': '22', 'start': 100, 'end': 200}])[0], 300, 301)
+
+def test_unique_keeps_the_first_occurrence():
+    assert unique(['22:3:4', '22:1:2', '22:3:4', '22:2:3', '22:1:2']) == ['22:3:4', '22:1:2', '22:2:3']
+    assert unique([]) == []
+
+def test_chromosome_key():
+    assert sorted(['X', '10', 'MT', '2', '1', 'Y'], key=chromosome_key) == ['1', '2', '10', 'MT', 'X', 'Y']
+
+def test_local_api_reads_the_planned_ranges(cohort, tmpdir):
+    config_path = write_config(tmpdir, cohort['config'], range_merge_gap=100, variant_ranges=[
+        {'chr': '22', 'start': 995, 'end': 1005},
+        # overlaps the range above, the variant at 1000 is read once
+        {'chr': '22', 'start': 999, 'end': 1001},
+        {'chr': '22', 'start': 1025, 'end': 1035},
+        {'chr': '22', 'start': 2005, 'end': 2030},
+    ])
+    # 1010 and 1020 are only in the gap of the first window
+    assert LOCAL_API(config_path).variant_name_list == ['22:1000:1001', '22:1030:1031', '22:2010:2011', '22:2020:2021']
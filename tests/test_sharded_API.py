@@ -0,0 +1,21 @@
+import pytest
+from ID3_Class import ID3
+from sharded_API import SHARDED_API
+from synthetic_cohort import write_config, tree_structure
+
+@pytest.mark.parametrize('local_shards', [2, 3])
+def test_sharded_tree_matches_local(cohort, tmpdir, local_shards):
+    local = ID3(cohort['config_path'])
+    local.train()
+
+    sharded = ID3(write_config(tmpdir, cohort['config'], local_shards=local_shards), backend='sharded')
+    try:
+        sharded.train()
+        assert sharded.api.variant_name_list == local.api.variant_name_list
+        assert tree_structure(sharded.root_node) == tree_structure(local.root_node)
+    finally:
+        sharded.api.close()
+
+def test_shard_addresses_need_an_authkey(cohort, tmpdir):
+    with pytest.raises(ValueError):
+        SHARDED_API(write_config(tmpdir, cohort['config'], shard_addresses=['127.0.0.1:9000']))
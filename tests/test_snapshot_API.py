@@ -0,0 +1,168 @@
+import json
+import threading
+import pytest
+from ID3_Class import ID3
+from ConfusionMatrix import ConfusionMatrix
+from local_API import LOCAL_API, is_carrier
+from snapshot_API import SNAPSHOT_API
+from synthetic_cohort import POPULATIONS, VARIANTS, tree_structure
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+class StubServer:
+    """
+    Stand-in for the ga4gh_server with one variant set per population of the synthetic
+    cohort. Answers the searches used by SNAPSHOT_API a page of `pageSize` results at a
+    time and records every request
+
+    Attributes:
+        variant_sets (list): the variant sets of the dataset, can be changed by the tests
+        ethnicities (dict): patient ID mapped to its ethnicity, can be changed by the tests
+        genotypes (dict): sample mapped to its genotypes, can be changed by the tests
+        requests (list): (endpoint, page token) of every request
+    """
+    def __init__(self, cohort):
+        self.cohort = cohort
+        self.variant_sets = [{'id': 'vs_%s' % population, 'name': population, 'datasetId': 'ds'}
+                             for population in POPULATIONS]
+        self.ethnicities = dict(cohort['ancestries'])
+        self.genotypes = dict((sample, list(cohort['genotypes'][sample])) for sample in cohort['samples'])
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode())
+                data = json.dumps(stub.answer(self.path.strip('/'), body)).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%s/' % self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def samples(self, variant_set_id):
+        return [sample for sample in self.cohort['samples'] if 'vs_%s' % self.cohort['ancestries'][sample] == variant_set_id]
+
+    def answer(self, endpoint, body):
+        self.requests.append((endpoint, body.get('pageToken')))
+        if endpoint == 'variantsets/search':
+            key, results = 'variantSets', self.variant_sets
+        elif endpoint == 'callsets/search':
+            key, results = 'callSets', [{'id': 'cs_%s' % sample, 'name': sample}
+                                        for sample in self.samples(body['variantSetId'])]
+        elif endpoint == 'patients/search':
+            key, results = 'patients', [{'patientId': sample, 'ethnicity': self.ethnicities[sample]}
+                                        for sample in self.cohort['samples']]
+        elif endpoint == 'variants/search':
+            key, results = 'variants', []
+            samples = [sample for sample in self.samples(body['variantSetId']) if 'cs_%s' % sample in body['callSetIds']]
+            for idx, (start, frequencies) in enumerate(VARIANTS):
+                if body['referenceName'] == '22' and int(body['start']) <= start < int(body['end']):
+                    calls = [{'callSetId': 'cs_%s' % sample, 'genotype': list(self.genotypes[sample][idx])}
+                             for sample in samples]
+                    # a call of a call set that was not requested is ignored
+                    calls.append({'callSetId': 'cs_unknown', 'genotype': [1, 1]})
+                    results.append({'start': str(start), 'end': str(start + 1), 'calls': calls})
+        page_start = int(body.get('pageToken') or 0)
+        page_end = page_start + int(body['pageSize'])
+        page = {key: results[page_start:page_end]}
+        if page_end < len(results):
+            page['nextPageToken'] = str(page_end)
+        return {'results': page}
+
+    def endpoints(self):
+        return sorted(set(endpoint for endpoint, page_token in self.requests))
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def server(cohort):
+    server = StubServer(cohort)
+    yield server
+    server.close()
+
+@pytest.fixture
+def snapshot_config(cohort, server, tmpdir):
+    config = dict(cohort['config'], ga4gh_server_url=server.url, ga4gh_page_size=3,
+                  snapshot_path=str(tmpdir.join('snapshot.json')))
+    config_path = str(tmpdir.join('config.json'))
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    return config_path
+
+def test_snapshot_matches_local(cohort, server, snapshot_config):
+    snapshot = SNAPSHOT_API(snapshot_config)
+    local = LOCAL_API(cohort['config_path'])
+    # every page of the searches was read
+    assert ('variants/search', '3') in server.requests
+    assert ('patients/search', '57') in server.requests
+    # every request went through the GA4GH_API client
+    assert snapshot.server.request_count == len(server.requests)
+    assert snapshot.variant_name_list == local.variant_name_list
+    assert sorted(snapshot.indiv_list) == sorted(local.indiv_list)
+
+    snapshot_id3 = ID3(api=snapshot)
+    snapshot_id3.train()
+    local_id3 = ID3(cohort['config_path'])
+    local_id3.train()
+    assert tree_structure(snapshot_id3.root_node) == tree_structure(local_id3.root_node)
+
+    matrix = ConfusionMatrix(snapshot_config, backend='snapshot')
+    assert matrix.conf_matrix == ConfusionMatrix(cohort['config_path']).conf_matrix
+
+def test_snapshot_is_reused_until_the_dataset_changes(server, snapshot_config):
+    variant_name_list = SNAPSHOT_API(snapshot_config).variant_name_list
+
+    # the fingerprint matches, only the variant sets and the patients are listed
+    del server.requests[:]
+    assert SNAPSHOT_API(snapshot_config).variant_name_list == variant_name_list
+    assert server.endpoints() == ['patients/search', 'variantsets/search']
+
+    # a variant set changed, the snapshot is pulled again
+    del server.requests[:]
+    server.variant_sets[0]['metadata'] = [{'key': 'version', 'value': '2'}]
+    SNAPSHOT_API(snapshot_config)
+    assert 'variants/search' in server.endpoints()
+
+    # the ethnicity of a patient changed, the snapshot is pulled again
+    del server.requests[:]
+    sample = sorted(server.ethnicities)[0]
+    server.ethnicities[sample] = 'OTHER'
+    snapshot = SNAPSHOT_API(snapshot_config)
+    assert 'variants/search' in server.endpoints()
+    assert snapshot.snapshot['ancestries'][sample] == 'OTHER'
+
+    # a forced refresh pulls the snapshot even if it is up to date
+    with open(snapshot_config) as f:
+        config = json.load(f)
+    config['snapshot_refresh'] = True
+    del server.requests[:]
+    SNAPSHOT_API(snapshot_config, config=config)
+    assert 'variants/search' in server.endpoints()
+
+def test_no_calls_are_not_carriers(cohort, server, snapshot_config):
+    samples = cohort['samples']
+    for sample in samples[::4]:
+        server.genotypes[sample][0] = (-1, -1)
+    for sample in samples[1::4]:
+        server.genotypes[sample][0] = (-1, 1)
+    snapshot = SNAPSHOT_API(snapshot_config)
+
+    variant_idx = snapshot.variant_name_list.index('22:%s:%s' % (VARIANTS[0][0], VARIANTS[0][0] + 1))
+    carriers = set(sample for sample, variant_idxs in snapshot.snapshot['samples'].items() if variant_idx in variant_idxs)
+    assert carriers == set(sample for sample in samples if is_carrier(server.genotypes[sample][0]))
+    assert not carriers & set(samples[::4] + samples[1::4])
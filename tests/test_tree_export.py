@@ -0,0 +1,63 @@
+import json
+import pytest
+from ID3_Class import ID3
+from tree_export import subtree_size
+
+@pytest.fixture(scope='module')
+def id3(cohort):
+    id3 = ID3(cohort['config_path'])
+    id3.train()
+    return id3
+
+def check_node(loaded, node, depth, max_depth, min_samples):
+    """
+    Checks a node loaded from the JSON against the node of the tree
+
+    Returns:
+        (tuple): number of nodes and leaves of the tree below the node, the collapsed
+                 subtrees counted by their summary
+    """
+    assert loaded['variant_name'] == node.variant_name
+    assert loaded['with_variant'] == node.with_variant
+    assert loaded['total_count'] == node.total_count
+    assert loaded['counts'] == dict((k, v) for k, v in node.subset.items() if v)
+    if node.children and ((max_depth is not None and depth >= max_depth) or node.total_count < min_samples):
+        assert loaded['children'] == []
+        assert (loaded['collapsed']['nodes'], loaded['collapsed']['leaves']) == subtree_size(node)
+        return subtree_size(node)
+
+    assert 'collapsed' not in loaded
+    assert len(loaded['children']) == len(node.children)
+    nodes, leaves = 1, 0 if node.children else 1
+    for loaded_child, child in zip(loaded['children'], node.children):
+        child_nodes, child_leaves = check_node(loaded_child, child, depth + 1, max_depth, min_samples)
+        nodes += child_nodes
+        leaves += child_leaves
+    return nodes, leaves
+
+def collapsed_nodes(loaded):
+    stack = [loaded]
+    collapsed = 0
+    while stack:
+        node = stack.pop()
+        collapsed += 'collapsed' in node
+        stack.extend(node['children'])
+    return collapsed
+
+@pytest.mark.parametrize('max_depth, min_samples, collapsed', [
+    (None, 0, False),
+    (0, 0, True),
+    (2, 0, True),
+    (None, 15, True),
+    (3, 10, True),
+])
+def test_write_json_collapses_subtrees(id3, tmpdir, max_depth, min_samples, collapsed):
+    path = id3.export_tree(str(tmpdir.join('tree')), 'json', max_depth=max_depth, min_samples=min_samples)
+    with open(path) as f:
+        loaded = json.load(f)
+
+    # the written nodes and the collapsed summaries add up to the whole tree
+    assert check_node(loaded, id3.root_node, 0, max_depth, min_samples) == subtree_size(id3.root_node)
+    assert (collapsed_nodes(loaded) > 0) == collapsed
+    if max_depth == 0:
+        assert loaded['children'] == []
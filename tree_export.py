@@ -0,0 +1,127 @@
+import json
+from ID3_Node import ID3_Node
+
+def subtree_size(node):
+    """
+    Counts the nodes and leaves below a node, the node included
+
+    Args:
+        node (ID3_Node): root of the subtree
+
+    Returns:
+        (tuple): number of nodes, number of leaves
+    """
+    nodes = 0
+    leaves = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        if node.children:
+            stack.extend(node.children)
+        else:
+            leaves += 1
+    return nodes, leaves
+
+def walk(root_node, max_depth=None, min_samples=0):
+    """
+    Walks the tree in preorder without recursion. A node deeper than `max_depth` or with
+    fewer than `min_samples` people is not walked into, its subtree is collapsed into the
+    node and summarized by its size instead
+
+    Args:
+        root_node (ID3_Node): the root node of the tree
+        max_depth (int): depth of the deepest nodes walked, no limit if None
+        min_samples (int): minimum number of people in a node to walk into its children
+
+    Returns:
+        (generator): (node_id, parent_id, depth, node, summary) for every node walked, where
+                     summary is (nodes, leaves) of a collapsed subtree and None otherwise,
+                     followed by None once all the children of the node were walked
+    """
+    next_id = 0
+    stack = [(root_node, None, 0)]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            yield None
+            continue
+        node, parent_id, depth = item
+        node_id = next_id
+        next_id += 1
+        collapse = bool(node.children) and ((max_depth is not None and depth >= max_depth) or node.total_count < min_samples)
+        yield node_id, parent_id, depth, node, subtree_size(node) if collapse else None
+        stack.append(None)
+        if not collapse:
+            for child in reversed(node.children):
+                stack.append((child, node_id, depth + 1))
+
+def label(node, summary):
+    """
+    Creates the label of a node with `ID3_Node.name_func`, adding the size of the
+    subtree of a collapsed node
+
+    Returns:
+        (str): the label
+    """
+    ret_str = ID3_Node.name_func(node)
+    if summary:
+        ret_str += "\n collapsed: %s nodes | %s leaves" % summary
+    return ret_str
+
+def write_dot(root_node, f, max_depth=None, min_samples=0):
+    """
+    Writes the tree in the DOT format one node at a time
+
+    Args:
+        root_node (ID3_Node): the root node of the tree
+        f (file): file to write to
+        max_depth (int): depth of the deepest nodes written, no limit if None
+        min_samples (int): minimum number of people in a node to write its children
+    """
+    f.write('digraph tree {\n')
+    for item in walk(root_node, max_depth, min_samples):
+        if item is None:
+            continue
+        node_id, parent_id, depth, node, summary = item
+        f.write('    n%s [label=%s%s];\n' % (node_id, json.dumps(label(node, summary)), ', shape=box, style=dashed' if summary else ''))
+        if parent_id is not None:
+            f.write('    n%s -> n%s;\n' % (parent_id, node_id))
+    f.write('}\n')
+
+def write_json(root_node, f, max_depth=None, min_samples=0):
+    """
+    Writes the tree as nested JSON objects one node at a time. Every node has the keys
+    `variant_name`, `with_variant`, `counts`, `total_count`, `most_common_ancestry` and
+    `children`, and a collapsed node also has `collapsed` with the size of its subtree
+
+    Args:
+        root_node (ID3_Node): the root node of the tree
+        f (file): file to write to
+        max_depth (int): depth of the deepest nodes written, no limit if None
+        min_samples (int): minimum number of people in a node to write its children
+    """
+    # whether the node being written already has a child written, one flag per open node
+    has_child = [False]
+    for item in walk(root_node, max_depth, min_samples):
+        if item is None:
+            has_child.pop()
+            f.write(']}')
+            continue
+        node_id, parent_id, depth, node, summary = item
+        if has_child[-1]:
+            f.write(',')
+        has_child[-1] = True
+        has_child.append(False)
+
+        fields = [
+            ('variant_name', node.variant_name),
+            ('with_variant', node.with_variant),
+            ('counts', dict((k, v) for k, v in node.subset.items() if v)),
+            ('total_count', node.total_count),
+            ('most_common_ancestry', node.most_common_ancestry),
+        ]
+        if summary:
+            fields.append(('collapsed', {'nodes': summary[0], 'leaves': summary[1]}))
+        f.write('\n%s{%s, "children": [' % (' ' * depth, ', '.join('%s: %s' % (json.dumps(k), json.dumps(v, sort_keys=True)) for k, v in fields)))
+    f.write('\n')